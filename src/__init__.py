@@ -1,31 +1,47 @@
-"""Subtitle Optimizer - Core library package."""
+"""Subtitle Optimizer - Core library package.
+
+Only the interjection word lists are imported eagerly; every other public
+name is resolved from its submodule on first access (PEP 562), so callers
+that only need SRT parsing don't pay for importing the whole pipeline.
+"""
+
+import importlib
 
-from .interjection_remover import InterjectionRemoveContext, RemoveInterjection
 from .interjections_en import INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN
-from .srt_processor import (
-    SubtitleEntry,
-    load_srt,
-    save_srt,
-    calculate_cps,
-    get_subtitle_stats,
-)
-from .cps_optimizer import (
-    OptimizationConstraints,
-    extend_timing,
-    can_merge,
-    merge_subtitles,
-    reduce_lines,
-    optimize_cps,
-)
-from .llm_shortener import (
-    HighCPSSegment,
-    find_high_cps_segments,
-    build_shortening_prompt,
-    shorten_with_llm,
-    apply_shortened_text,
-    export_segments_json,
-    load_segments_json,
-)
+
+# Public name -> submodule that defines it
+_LAZY = {
+    # Interjection removal
+    "InterjectionRemoveContext": "interjection_remover",
+    "RemoveInterjection": "interjection_remover",
+    # SRT processing
+    "SubtitleEntry": "srt_processor",
+    "SubtitleBatch": "srt_processor",
+    "load_srt": "srt_processor",
+    "load_srt_batch": "srt_processor",
+    "save_srt": "srt_processor",
+    "calculate_cps": "srt_processor",
+    "get_subtitle_stats": "srt_processor",
+    # CPS optimization
+    "OptimizationConstraints": "cps_optimizer",
+    "extend_timing": "cps_optimizer",
+    "can_merge": "cps_optimizer",
+    "merge_subtitles": "cps_optimizer",
+    "reduce_lines": "cps_optimizer",
+    "optimize_cps": "cps_optimizer",
+    "optimize_batch": "cps_optimizer",
+    "iter_optimize_cps": "cps_optimizer",
+    "optimize_many": "cps_optimizer",
+    # LLM shortening
+    "HighCPSSegment": "llm_shortener",
+    "find_high_cps_segments": "llm_shortener",
+    "build_shortening_prompt": "llm_shortener",
+    "shorten_with_llm": "llm_shortener",
+    "apply_shortened_text": "llm_shortener",
+    "export_segments_json": "llm_shortener",
+    "load_segments_json": "llm_shortener",
+    "LLMCache": "llm_cache",
+}
 
 __all__ = [
     # Interjection removal
@@ -35,7 +51,9 @@ __all__ = [
     "INTERJECTIONS_SKIP_EN",
     # SRT processing
     "SubtitleEntry",
+    "SubtitleBatch",
     "load_srt",
+    "load_srt_batch",
     "save_srt",
     "calculate_cps",
     "get_subtitle_stats",
@@ -46,6 +64,9 @@ __all__ = [
     "merge_subtitles",
     "reduce_lines",
     "optimize_cps",
+    "optimize_batch",
+    "iter_optimize_cps",
+    "optimize_many",
     # LLM shortening
     "HighCPSSegment",
     "find_high_cps_segments",
@@ -54,4 +75,22 @@ __all__ = [
     "apply_shortened_text",
     "export_segments_json",
     "load_segments_json",
+    "LLMCache",
 ]
+
+
+def __getattr__(name: str):
+    """Import the submodule defining ``name`` on first access."""
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
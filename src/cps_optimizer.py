@@ -3,14 +3,21 @@
 Handles timing extension, subtitle merging, and line reduction.
 """
 
+import heapq
+import os
+from functools import lru_cache
+from itertools import compress, repeat
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from .srt_processor import SubtitleEntry, calculate_cps
+from .srt_processor import SubtitleBatch, SubtitleEntry, load_srt
 
+_ONE_US = timedelta(microseconds=1)
+_US_PER_SECOND = 1_000_000
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class OptimizationConstraints:
     """Constraints for subtitle optimization."""
     max_chars: int = 90
@@ -37,31 +44,53 @@ def extend_timing(
     Returns:
         New end time (may be unchanged if no extension possible).
     """
-    current_end = subtitle.end
-    current_duration = subtitle.duration
+    end_us = subtitle.end_us
+    new_end_us = _extend_end_us(
+        subtitle.start_us,
+        end_us,
+        next_subtitle.start_us if next_subtitle is not None else None,
+        max_duration,
+        timedelta(seconds=max_duration) // _ONE_US,
+        min_gap,
+        timedelta(seconds=min_gap) // _ONE_US
+    )
+    
+    if new_end_us == end_us:
+        return subtitle.end
+    return timedelta(microseconds=new_end_us)
+
+
+def _extend_end_us(
+    start_us: int,
+    end_us: int,
+    next_start_us: Optional[int],
+    max_duration: float,
+    max_duration_us: int,
+    min_gap: float,
+    min_gap_us: int
+) -> int:
+    """extend_timing() on plain microsecond values.
     
+    Limits are passed both in seconds (for the threshold checks) and in
+    microseconds (for the new end), so callers can convert them once.
+    """
     # Already at max duration
-    if current_duration >= max_duration:
-        return current_end
+    if (end_us - start_us) / _US_PER_SECOND >= max_duration:
+        return end_us
     
     # Calculate maximum possible end time
-    max_end_by_duration = subtitle.start + timedelta(seconds=max_duration)
-    
-    if next_subtitle is None:
-        # Last subtitle - extend to max duration
-        return max_end_by_duration
-    
-    # Calculate available gap
-    gap = (next_subtitle.start - current_end).total_seconds()
+    new_end_us = start_us + max_duration_us
     
-    if gap <= min_gap:
-        # No room to extend
-        return current_end
-    
-    # Extend up to next subtitle minus minimum gap, or max duration
-    max_end_by_gap = next_subtitle.start - timedelta(seconds=min_gap)
+    if next_start_us is not None:
+        # Calculate available gap
+        if (next_start_us - end_us) / _US_PER_SECOND <= min_gap:
+            # No room to extend
+            return end_us
+        
+        # Extend up to next subtitle minus minimum gap, or max duration
+        new_end_us = min(new_end_us, next_start_us - min_gap_us)
     
-    return min(max_end_by_duration, max_end_by_gap)
+    return new_end_us
 
 
 def can_merge(
@@ -79,19 +108,35 @@ def can_merge(
     Returns:
         True if subtitles can be merged.
     """
+    return _can_merge(
+        sub1.char_count, sub2.char_count,
+        sub1.line_count, sub2.line_count,
+        (sub2.end_us - sub1.start_us) / _US_PER_SECOND,
+        constraints.max_chars, constraints.max_lines, constraints.max_duration
+    )
+
+
+def _can_merge(
+    c1: int,
+    c2: int,
+    l1: int,
+    l2: int,
+    dur_s: float,
+    max_chars: int,
+    max_lines: int,
+    max_duration: float
+) -> bool:
+    """can_merge() on plain char/line counts and combined duration in seconds."""
     # Check combined char count
-    combined_chars = sub1.char_count + sub2.char_count
-    if combined_chars > constraints.max_chars:
+    if c1 + c2 > max_chars:
         return False
     
     # Check combined line count
-    combined_lines = sub1.line_count + sub2.line_count
-    if combined_lines > constraints.max_lines:
+    if l1 + l2 > max_lines:
         return False
     
     # Check combined duration
-    combined_duration = (sub2.end - sub1.start).total_seconds()
-    if combined_duration > constraints.max_duration:
+    if dur_s > max_duration:
         return False
     
     return True
@@ -107,14 +152,72 @@ def merge_subtitles(sub1: SubtitleEntry, sub2: SubtitleEntry) -> SubtitleEntry:
     Returns:
         New merged subtitle.
     """
-    merged_text = f"{sub1.text}\n{sub2.text}"
+    return sub1.merged_with(sub2)
+
+
+# Up to this many lines, rescanning the pair sums beats heap bookkeeping
+_SMALL_MERGE_LINES = 6
+
+
+def _merge_shortest_pairs_small(lengths: list[int], max_lines: int) -> list[int]:
+    """_merge_shortest_pairs() for a handful of lines, by rescanning.
     
-    return SubtitleEntry(
-        index=sub1.index,
-        start=sub1.start,
-        end=sub2.end,
-        text=merged_text
-    )
+    Same result: each step joins the pair with the smallest combined
+    length, leftmost on ties.
+    """
+    length = list(lengths)
+    heads = list(range(len(length)))
+    while len(length) > max_lines:
+        sums = [a + b for a, b in zip(length, length[1:])]
+        k = sums.index(min(sums))
+        length[k] = sums[k] + 1
+        del length[k + 1], heads[k + 1]
+    return heads
+
+
+def _merge_shortest_pairs(lengths: list[int], max_lines: int) -> list[int]:
+    """Repeatedly join the shortest adjacent pair of lines.
+    
+    Lines are kept in a doubly linked list and candidate pairs in a min-heap
+    keyed by (combined length, position), so each join costs O(log n).
+    Heap entries made stale by an earlier join are skipped when popped.
+    
+    Args:
+        lengths: Length of each line.
+        max_lines: Number of lines to stop at.
+        
+    Returns:
+        Index of the first original line of each resulting line.
+    """
+    n = len(lengths)
+    length = list(lengths)
+    nxt = list(range(1, n + 1))  # n marks the end of the list
+    prv = list(range(-1, n - 1))
+    alive = [True] * n
+    
+    heap = [(length[i] + length[i + 1], i, i + 1) for i in range(n - 1)]
+    heapq.heapify(heap)
+    
+    count = n
+    while count > max_lines:
+        combined, i, j = heapq.heappop(heap)
+        if not alive[i] or nxt[i] != j or length[i] + length[j] != combined:
+            continue
+        
+        # Join line j onto line i (with a separating space)
+        length[i] = combined + 1
+        alive[j] = False
+        k = nxt[j]
+        nxt[i] = k
+        if k < n:
+            prv[k] = i
+            heapq.heappush(heap, (length[i] + length[k], i, k))
+        p = prv[i]
+        if p >= 0:
+            heapq.heappush(heap, (length[p] + length[i], p, i))
+        count -= 1
+    
+    return [i for i in range(n) if alive[i]]
 
 
 def reduce_lines(text: str, max_lines: int = 2) -> str:
@@ -127,29 +230,159 @@ def reduce_lines(text: str, max_lines: int = 2) -> str:
     Returns:
         Text with at most max_lines lines.
     """
+    # Most texts are already short enough: answer from a count, not a split
+    if text.count('\n') < max_lines:
+        return text
+    return _reduce_long_text(text, max_lines)
+
+
+# Subtitle files repeat multi-line cues (songs, signs, catchphrases), and the
+# result depends only on the text and the limit
+@lru_cache(maxsize=4096)
+def _reduce_long_text(text: str, max_lines: int) -> str:
+    """reduce_lines() for text with more than max_lines lines."""
     lines = text.split('\n')
     
-    if len(lines) <= max_lines:
-        return text
+    # Fast paths for the usual limits
+    if max_lines == 1:
+        return ' '.join(lines)
+    if max_lines == 2 and len(lines) == 3:
+        # A single join: the middle line goes with the shorter outer line
+        first, middle, last = lines
+        if len(first) <= len(last):
+            return f"{first} {middle}\n{last}"
+        return f"{first}\n{middle} {last}"
     
     # Combine lines to reduce count
     # Strategy: combine shortest consecutive lines
-    while len(lines) > max_lines:
-        # Find the best pair to combine (shortest combined length)
-        best_idx = 0
-        best_len = float('inf')
-        
-        for i in range(len(lines) - 1):
-            combined_len = len(lines[i]) + len(lines[i + 1])
-            if combined_len < best_len:
-                best_len = combined_len
-                best_idx = i
+    merge = _merge_shortest_pairs_small if len(lines) <= _SMALL_MERGE_LINES else _merge_shortest_pairs
+    heads = merge([len(line) for line in lines], max_lines)
+    bounds = heads + [len(lines)]
+    
+    return '\n'.join(' '.join(lines[a:b]) for a, b in zip(bounds, bounds[1:]))
+
+
+# Per-entry actions planned by _plan_merges
+_KEEP = 0
+_MERGE_NEXT = 1
+_ABSORBED = 2
+
+# bytes.translate() table turning planned actions into a keep mask
+_KEPT = bytes(0 if action == _ABSORBED else 1 for action in range(256))
+
+
+def _extended_end_us(
+    start_us: int,
+    end_us: int,
+    char_count: int,
+    next_start_us: Optional[int],
+    target_cps: float,
+    max_duration: float,
+    max_duration_us: int,
+    min_gap: float,
+    min_gap_us: int
+) -> int:
+    """End time (microseconds) of an entry after extending it if CPS is too high.
+    
+    Returns end_us unchanged if the entry is not too fast, is already at
+    max duration, or has no room before the next entry.
+    """
+    duration = (end_us - start_us) / _US_PER_SECOND
+    if duration > 0 and char_count / duration <= target_cps:
+        return end_us
+    
+    new_end_us = _extend_end_us(
+        start_us, end_us, next_start_us,
+        max_duration, max_duration_us, min_gap, min_gap_us
+    )
+    # Never shorten an entry
+    return new_end_us if new_end_us > end_us else end_us
+
+
+def _plan_merges(
+    starts: list[int],
+    ends: list[int],
+    chars: list[int],
+    lines: list[int],
+    target_cps: float,
+    max_chars: int,
+    max_lines: int,
+    max_duration: float,
+    min_gap: float
+) -> Optional[bytearray]:
+    """Extend high-CPS entries, then plan merges.
+    
+    Only entries above target CPS are visited for extension, and only
+    pairs that fit the char, line and duration limits are visited for
+    merging. Extension only depends on the unchanged start of the next
+    entry, so merge decisions see final end times. Merges are greedy and
+    non-overlapping.
+    
+    Args:
+        starts: Start times in microseconds.
+        ends: End times in microseconds; extended entries are updated in place.
+        chars: Character counts.
+        lines: Line counts.
+        target_cps: Target maximum CPS.
+        max_chars: Maximum characters per entry.
+        max_lines: Maximum lines per entry.
+        max_duration: Maximum duration in seconds.
+        min_gap: Minimum gap to keep before the next entry, in seconds.
         
-        # Combine the pair
-        lines[best_idx] = lines[best_idx] + ' ' + lines[best_idx + 1]
-        lines.pop(best_idx + 1)
+    Returns:
+        One action per entry: _KEEP, _MERGE_NEXT (merge with the following
+        entry) or _ABSORBED (merged into the preceding entry), or None if
+        no entry is extended or merged.
+    """
+    n = len(starts)
+    max_duration_us = timedelta(seconds=max_duration) // _ONE_US
+    min_gap_us = timedelta(seconds=min_gap) // _ONE_US
+    
+    # Pairs (i - 1, i) that may merge, screened once up front. Extension
+    # only moves ends later, so the unextended span is a lower bound.
+    fits = [
+        c1 + c2 <= max_chars and l1 + l2 <= max_lines
+        and (e2 - s1) / _US_PER_SECOND <= max_duration
+        for s1, c1, l1, e2, c2, l2 in zip(
+            starts, chars, lines, ends[1:], chars[1:], lines[1:]
+        )
+    ]
+    
+    # Entries above target CPS (or with no duration at all)
+    too_fast = [
+        i for i, (start, end, count) in enumerate(zip(starts, ends, chars))
+        if end <= start or count / ((end - start) / _US_PER_SECOND) > target_cps
+    ]
+    
+    # Nothing is fast enough to extend and no pair could merge
+    if not too_fast and not any(fits):
+        return None
     
-    return '\n'.join(lines)
+    extended = False
+    for i in too_fast:
+        end = ends[i]
+        new_end = _extend_end_us(
+            starts[i], end, starts[i + 1] if i + 1 < n else None,
+            max_duration, max_duration_us, min_gap, min_gap_us
+        )
+        if new_end > end:
+            ends[i] = new_end
+            extended = True
+    
+    actions = bytearray(n)
+    for i in compress(range(1, n), fits):
+        # Merge into the previous entry if it is still on its own
+        if actions[i - 1] != _KEEP:
+            continue
+        # Only the (possibly extended) duration is left to check
+        span = (ends[i] - starts[i - 1]) / _US_PER_SECOND
+        if span and span <= max_duration and (chars[i - 1] + chars[i]) / span <= target_cps:
+            actions[i - 1] = _MERGE_NEXT
+            actions[i] = _ABSORBED
+    
+    if not extended and not any(actions):
+        return None
+    return actions
 
 
 def optimize_cps(
@@ -160,6 +393,7 @@ def optimize_cps(
     """Optimize subtitles to reduce CPS.
     
     Applies timing extension and merging to reduce high CPS values.
+    See iter_optimize_cps() for a streaming variant.
     
     Args:
         subtitles: List of subtitle entries.
@@ -175,50 +409,200 @@ def optimize_cps(
     if constraints is None:
         constraints = OptimizationConstraints()
     
-    result = []
+    max_chars = constraints.max_chars
+    max_lines = constraints.max_lines
+    max_duration = constraints.max_duration
+    min_gap = constraints.min_gap
     
-    for i, sub in enumerate(subtitles):
-        # Get next subtitle
-        next_sub = subtitles[i + 1] if i + 1 < len(subtitles) else None
-        
-        # Check if CPS is too high
-        current_cps = calculate_cps(sub)
+    batch = SubtitleBatch.from_entries(subtitles)
+    ends = batch.ends_us
+    actions = _plan_merges(
+        batch.starts_us, ends, batch.char_counts, batch.line_counts,
+        target_cps, max_chars, max_lines, max_duration, min_gap
+    )
+    if actions is None:
+        return list(subtitles)
+    
+    # Every merge absorbs exactly one entry, so the output size is known
+    result: list[SubtitleEntry] = [None] * (len(actions) - actions.count(_ABSORBED))
+    w = 0
+    for i, action in enumerate(actions):
+        sub = subtitles[i]
+        if action == _KEEP:
+            if ends[i] != sub.end_us:
+                sub = sub.with_end(timedelta(microseconds=ends[i]))
+            result[w] = sub
+            w += 1
+        elif action == _MERGE_NEXT:
+            # Build the merged entry straight from the columns rather than
+            # materialising both (possibly extended) halves first
+            result[w] = sub.merged_with(subtitles[i + 1], timedelta(microseconds=ends[i + 1]))
+            w += 1
+    
+    return result
+
+
+def optimize_batch(
+    batch: SubtitleBatch,
+    target_cps: float = 21.0,
+    constraints: Optional[OptimizationConstraints] = None
+) -> SubtitleBatch:
+    """optimize_cps() for subtitles stored column-wise.
+    
+    Extensions and merges are applied to the columns directly; no
+    SubtitleEntry is built. The input batch is left unchanged.
+    
+    Args:
+        batch: Subtitles to optimize.
+        target_cps: Target maximum CPS.
+        constraints: Optimization constraints (uses defaults if None).
         
-        if current_cps > target_cps:
-            # Try to extend timing
-            new_end = extend_timing(sub, next_sub, constraints.max_duration, constraints.min_gap)
-            
-            if new_end > sub.end:
-                sub = SubtitleEntry(
-                    index=sub.index,
-                    start=sub.start,
-                    end=new_end,
-                    text=sub.text
-                )
+    Returns:
+        A new batch with the optimized subtitles.
+    """
+    if constraints is None:
+        constraints = OptimizationConstraints()
+    
+    ends = list(batch.ends_us)
+    actions = _plan_merges(
+        batch.starts_us, ends, batch.char_counts, batch.line_counts, target_cps,
+        constraints.max_chars, constraints.max_lines, constraints.max_duration, constraints.min_gap
+    )
+    
+    texts = list(batch.texts)
+    chars = list(batch.char_counts)
+    lines = list(batch.line_counts)
+    if actions is None:
+        return SubtitleBatch(list(batch.indexes), list(batch.starts_us), ends, texts, chars, lines)
+    
+    # Fold each absorbed entry into the one before it, then drop it
+    i = actions.find(_MERGE_NEXT)
+    while i >= 0:
+        ends[i] = ends[i + 1]
+        texts[i] = '\n'.join((texts[i], texts[i + 1]))
+        chars[i] += chars[i + 1]
+        lines[i] += lines[i + 1]
+        i = actions.find(_MERGE_NEXT, i + 2)
+    
+    kept = actions.translate(_KEPT)
+    return SubtitleBatch(
+        indexes=list(compress(batch.indexes, kept)),
+        starts_us=list(compress(batch.starts_us, kept)),
+        ends_us=list(compress(ends, kept)),
+        texts=list(compress(texts, kept)),
+        char_counts=list(compress(chars, kept)),
+        line_counts=list(compress(lines, kept)),
+    )
+
+
+def iter_optimize_cps(
+    subtitles: Iterable[SubtitleEntry],
+    target_cps: float = 21.0,
+    constraints: Optional[OptimizationConstraints] = None
+) -> Iterator[SubtitleEntry]:
+    """Streaming variant of optimize_cps().
+    
+    Consumes entries lazily and yields the same result as optimize_cps(),
+    holding at most three entries at a time.
+    
+    Args:
+        subtitles: Iterable of subtitle entries.
+        target_cps: Target maximum CPS.
+        constraints: Optimization constraints (uses defaults if None).
         
-        result.append(sub)
+    Yields:
+        Optimized subtitle entries.
+    """
+    if constraints is None:
+        constraints = OptimizationConstraints()
     
-    # Second pass: try merging
-    merged_result = []
-    skip_next = False
+    max_chars = constraints.max_chars
+    max_lines = constraints.max_lines
+    max_duration = constraints.max_duration
+    min_gap = constraints.min_gap
+    max_duration_us = timedelta(seconds=max_duration) // _ONE_US
+    min_gap_us = timedelta(seconds=min_gap) // _ONE_US
     
-    for i, sub in enumerate(result):
-        if skip_next:
-            skip_next = False
-            continue
+    def with_end(sub: SubtitleEntry, end_us: int) -> SubtitleEntry:
+        if end_us == sub.end_us:
+            return sub
+        return sub.with_end(timedelta(microseconds=end_us))
+    
+    # Previous entry (with its extended end) that may still absorb `sub`
+    pending: Optional[tuple[SubtitleEntry, int]] = None
+    entries = iter(subtitles)
+    sub = next(entries, None)
+    
+    while sub is not None:
+        next_sub = next(entries, None)
+        end_us = _extended_end_us(
+            sub.start_us, sub.end_us, sub.char_count,
+            next_sub.start_us if next_sub is not None else None,
+            target_cps, max_duration, max_duration_us, min_gap, min_gap_us
+        )
         
-        if i + 1 < len(result):
-            next_sub = result[i + 1]
-            
-            # Check if merging would help
-            combined_cps = (sub.char_count + next_sub.char_count) / (next_sub.end - sub.start).total_seconds()
-            
-            if combined_cps <= target_cps and can_merge(sub, next_sub, constraints):
-                merged = merge_subtitles(sub, next_sub)
-                merged_result.append(merged)
-                skip_next = True
+        if pending is not None:
+            prev, prev_end_us = pending
+            span = (end_us - prev.start_us) / _US_PER_SECOND
+            if span and _can_merge(
+                prev.char_count, sub.char_count, prev.line_count, sub.line_count,
+                span, max_chars, max_lines, max_duration
+            ) and (prev.char_count + sub.char_count) / span <= target_cps:
+                yield prev.merged_with(sub, timedelta(microseconds=end_us))
+                pending = None
+                sub = next_sub
                 continue
+            yield with_end(prev, prev_end_us)
         
-        merged_result.append(sub)
+        pending = (sub, end_us)
+        sub = next_sub
+    
+    if pending is not None:
+        yield with_end(*pending)
+
+
+def _optimize_file(
+    path: str,
+    target_cps: float,
+    constraints: Optional[OptimizationConstraints]
+) -> list[SubtitleEntry]:
+    """Load and optimize a single SRT file (worker for optimize_many)."""
+    return optimize_cps(load_srt(path), target_cps, constraints)
+
+
+def optimize_many(
+    paths: list[str],
+    target_cps: float = 21.0,
+    constraints: Optional[OptimizationConstraints] = None,
+    max_workers: Optional[int] = None
+) -> list[list[SubtitleEntry]]:
+    """Load and optimize several SRT files in parallel.
+    
+    The optimizer is pure Python and holds the GIL, so files are spread
+    over worker processes rather than threads.
+    
+    Args:
+        paths: Paths to the SRT files.
+        target_cps: Target maximum CPS.
+        constraints: Optimization constraints (uses defaults if None).
+        max_workers: Number of worker processes (defaults to the CPU count).
+        
+    Returns:
+        Optimized subtitle entries for each path, in the same order.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(paths))
+    
+    # Not worth starting processes for a single file
+    if max_workers <= 1:
+        return [_optimize_file(path, target_cps, constraints) for path in paths]
+    
+    # Imported here: multiprocessing is a noticeable share of this module's
+    # import time, and only this function needs it
+    from concurrent.futures import ProcessPoolExecutor
     
-    return merged_result
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            _optimize_file, paths, repeat(target_cps), repeat(constraints)
+        ))
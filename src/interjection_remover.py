@@ -7,6 +7,10 @@ https://github.com/SubtitleEdit/subtitleedit
 import os
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from .interjections_en import INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN
 
 
 @dataclass
@@ -18,15 +22,258 @@ class InterjectionRemoveContext:
     only_separated_lines: bool = False
 
 
+@lru_cache(maxsize=None)
+def _word_re(word: str) -> re.Pattern:
+    """Compiled case-insensitive whole-word pattern for an interjection."""
+    return re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Regex alternation of the words with shared prefixes factored out.
+    
+    The regex engine has no multi-literal search, so a flat "a|ab|abc"
+    alternation retries every word at every position; a trie lets it
+    reject a position after the first character or two.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Optional continuation is greedy, so longer words are tried first
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return build(trie)
+
+
+_WORD_CHAIN_RE = re.compile(r'\w+(?:-\w+)*')
+
+# bytes.translate() table for ASCII text: word characters are kept (letters
+# lowercased), everything else becomes a space, so split() yields the
+# lowercased \w+ runs
+_ASCII_WORD_TABLE = bytes(
+    c + 32 if 65 <= c <= 90
+    else c if 97 <= c <= 122 or 48 <= c <= 57 or c == 95
+    else 32
+    for c in range(256)
+)
+
+
+def _word_chains(lowered: str, max_hyphens: int) -> set[str]:
+    """Whole words and hyphen-joined runs of up to max_hyphens + 1 words.
+    
+    For ASCII text, r'\bword\b' matches case-insensitively exactly when
+    the lowercased word is in the returned set.
+    """
+    found = set(_WORD_CHAIN_RE.findall(lowered))
+    for chain in [c for c in found if '-' in c]:
+        parts = chain.split('-')
+        found.update(parts)
+        for size in range(2, min(len(parts), max_hyphens + 2)):
+            for i in range(len(parts) - size + 1):
+                found.add('-'.join(parts[i:i + size]))
+    return found
+
+
+def _find_word(lowered: str, word: str) -> int:
+    """Index of the first whole-word occurrence of word, or -1.
+    
+    Same result as searching lowered for r'\bword\b' when word starts and
+    ends with a word character, without going through the regex engine.
+    """
+    size = len(word)
+    end = len(lowered)
+    i = lowered.find(word)
+    while i >= 0:
+        j = i + size
+        if (i == 0 or not (lowered[i - 1].isalnum() or lowered[i - 1] == '_')) and (
+                j == end or not (lowered[j].isalnum() or lowered[j] == '_')):
+            return i
+        i = lowered.find(word, i + 1)
+    return -1
+
+
+class _InterjectionIndex:
+    """Finds which of a list of interjections occur in a text, in one scan."""
+    
+    def __init__(self, words: tuple[str, ...]):
+        self.words = words
+        self.words_lower = tuple(w.lower() for w in words)
+        self.lowered = frozenset(self.words_lower)
+        self.pattern = re.compile(r'\b(?:' + _trie_pattern(list(words)) + r')\b', re.IGNORECASE)
+        # Word sets are exact only for ASCII words made of \w runs joined
+        # by single hyphens (\b can then only fall on a hyphen inside them)
+        if all(w.isascii() and _WORD_CHAIN_RE.fullmatch(w) for w in words):
+            self.max_hyphens: Optional[int] = max((w.count('-') for w in words), default=0)
+            # Every hyphen-separated part of a matching word is a whole \w+
+            # run of the text, so texts sharing no run with these can't match
+            self.parts = frozenset(
+                part.encode('ascii') for w in self.words_lower for part in w.split('-'))
+        else:
+            self.max_hyphens = None
+    
+    def candidates(self, text: str):
+        """Lowercased container to test interjections against, or None if
+        none of them occurs as a whole word.
+        
+        For ASCII text this is the set of lowercased whole words (and
+        hyphenated runs) in the text; otherwise the lowercased text itself.
+        """
+        if self.max_hyphens is not None and text.isascii():
+            # Most cues contain no interjection: rule that out with a C-level
+            # tokenization before building the exact word set
+            if self.parts.isdisjoint(text.encode('ascii').translate(_ASCII_WORD_TABLE).split()):
+                return None
+            found = _word_chains(text.lower(), self.max_hyphens)
+            return None if self.lowered.isdisjoint(found) else found
+        
+        if self.pattern.search(text) is None:
+            return None
+        return text.lower()
+
+
+@lru_cache(maxsize=16)
+def _interjection_index(words: tuple[str, ...]) -> _InterjectionIndex:
+    """Cached _InterjectionIndex for a word list."""
+    return _InterjectionIndex(words)
+
+
+@lru_cache(maxsize=16)
+def _lowered_words(words: tuple[str, ...]) -> tuple[str, ...]:
+    """Cached lowercased copy of a word list."""
+    return tuple(w.lower() for w in words)
+
+
+# Build the index for the default list up front rather than on the first call
+_interjection_index(tuple(INTERJECTIONS_EN))
+
+
+# Clean-ups at the start of the text after removing an interjection at
+# a given index: (prefix, keep, drop) turns temp into
+# temp[:keep] + temp[keep + drop:] when temp starts with prefix.
+# All matching fixes are applied, in order.
+_LEADING_FIXES: dict[int, tuple[tuple[str, int, int], ...]] = {
+    0: (('... ', 0, 4),),
+    1: (
+        ('¿, ', 1, 2),
+        ('¿ ', 1, 1),
+        ('¡, ', 1, 2),
+        ('¡ ', 1, 1),
+        ('... ', 0, 4),
+    ),
+    3: (('<i>... ', 3, 4),),
+}
+
+
+def _first_leading_fixes(newline: str) -> dict[int, tuple[tuple[str, int, int], ...]]:
+    """Like _LEADING_FIXES, but only the first matching fix is applied."""
+    return {
+        0: (
+            (' —', 0, 2),
+            ('—', 0, 1),
+            ('...! ', 0, 5),
+            ('...? ', 0, 5),
+        ),
+        2: (
+            ('-  —', 2, 2),
+            ('- —', 2, 1),
+            ('- .' + newline, 2, 1 + len(newline)),
+            ('- !' + newline, 2, 1 + len(newline)),
+            ('- ?' + newline, 2, 1 + len(newline)),
+        ),
+    }
+
+
+_FIRST_LEADING_FIXES = {newline: _first_leading_fixes(newline) for newline in ('\n', '\r\n')}
+
+
+class _NewlineLiterals(NamedTuple):
+    """Literals built from the text's newline style, once per style."""
+    dash: str                     # newline + '-'
+    em_dash: str                  # newline + '—'
+    dash_space: str               # newline + '- '
+    italic_dash: str              # newline + '<i>-'
+    ellipsis_before: str          # ' ...' + newline
+    inverted_marks_before: tuple  # '¿?' / '¡!' followed by newline
+    sentence_breaks: tuple        # '.', '!', '?' (optionally + '</i>') + newline
+    italic_between: str           # newline + '<i>' + newline
+    italic_after: str             # newline + '<i>'
+    end_italic_between: str       # newline + '</i>' + newline
+    end_italic_before: str        # '</i>' + newline
+    italic_before: str            # '<i>' + newline
+    end_italic_after: str         # newline + '</i>'
+
+
+def _newline_literals(newline: str) -> _NewlineLiterals:
+    """_NewlineLiterals for one newline style."""
+    return _NewlineLiterals(
+        dash=newline + '-',
+        em_dash=newline + '—',
+        dash_space=newline + '- ',
+        italic_dash=newline + '<i>-',
+        ellipsis_before=' ...' + newline,
+        inverted_marks_before=('¿?' + newline, '¡!' + newline),
+        sentence_breaks=tuple(end + tag + newline for end in '.!?' for tag in ('', '</i>')),
+        italic_between=newline + '<i>' + newline,
+        italic_after=newline + '<i>',
+        end_italic_between=newline + '</i>' + newline,
+        end_italic_before='</i>' + newline,
+        italic_before='<i>' + newline,
+        end_italic_after=newline + '</i>',
+    )
+
+
+_NEWLINE_LITERALS = {newline: _newline_literals(newline) for newline in ('\n', '\r\n')}
+
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
+
 def remove_html_tags(text: str, keep_music_symbols: bool = True) -> str:
     """Remove HTML tags like <i>, </i>, <b>, etc."""
-    return re.sub(r'<[^>]+>', '', text)
+    if '<' not in text:
+        return text
+    return _HTML_TAG_RE.sub('', text)
+
+
+_STRIPPABLE_CHARS = '♪♫-–—‐…""\''
+
+
+def _is_effectively_empty(text: str) -> bool:
+    """Check if nothing is left once tags, whitespace and the music and
+    dash characters around the text are stripped.
+    
+    A tagged text that starts or ends with any other character cannot be
+    empty, so the tag substitution only runs when both ends are tags or
+    strippable characters.
+    """
+    if '<' not in text:
+        return not text.strip().strip(_STRIPPABLE_CHARS)
+    stripped = text.strip()
+    first, last = stripped[0], stripped[-1]
+    if (first != '<' and first not in _STRIPPABLE_CHARS) or (
+            last != '>' and last not in _STRIPPABLE_CHARS):
+        return False
+    return not _HTML_TAG_RE.sub('', stripped).strip().strip(_STRIPPABLE_CHARS)
 
 
 def has_sentence_ending(text: str) -> bool:
     """Check if text ends with sentence-ending punctuation."""
     if not text:
         return False
+    last = text[-1]
+    if not last.isspace():
+        # No trailing whitespace, so no need to copy the text to strip it
+        return last in '.!?…'
     text = text.rstrip()
     return bool(text) and text[-1] in '.!?…'
 
@@ -35,10 +282,15 @@ def capitalize_first_letter(text: str) -> str:
     """Capitalize the first letter of the text."""
     if not text:
         return text
-    for i, char in enumerate(text):
-        if char.isalpha():
-            return text[:i] + char.upper() + text[i+1:]
-    return text
+    # [^\W\d_] also matches a few numeric characters (e.g. "²"), so
+    # confirm each candidate with isalpha()
+    match = _LETTER_RE.search(text)
+    while match and not match.group().isalpha():
+        match = _LETTER_RE.search(text, match.end())
+    if match is None:
+        return text
+    i = match.start()
+    return text[:i] + text[i].upper() + text[i+1:]
 
 
 def split_to_lines(text: str) -> list[str]:
@@ -48,454 +300,488 @@ def split_to_lines(text: str) -> list[str]:
 
 def get_number_of_lines(text: str) -> int:
     """Get number of lines in text."""
-    return len(split_to_lines(text))
+    # Each line break, \r\n or \n, contains exactly one \n
+    return text.count('\n') + 1
 
 
 def remove_chars(text: str, *chars: str) -> str:
     """Remove specified characters from text."""
+    # A str.replace per char beats str.translate on subtitle-length lines:
+    # replace returns at C speed when the char is absent, while translate
+    # does a table lookup for every character
     result = text
     for char in chars:
         result = result.replace(char, '')
     return result
 
 
-class RemoveInterjection:
-    """Remove interjection words from subtitle text.
+# Characters ignored when checking whether a line is only punctuation
+_LINE_PUNCTUATION = ('.', '?', '!', '-', '—')
+
+# The same plus every character str.strip() treats as whitespace (none is
+# above U+3000), so one strip() call answers "only punctuation and spaces?"
+_LINE_PUNCTUATION_OR_SPACE = ''.join(_LINE_PUNCTUATION) + ''.join(
+    c for c in map(chr, range(0x3001)) if c.isspace())
+
+
+# Subtitle files repeat many short cues verbatim ("- Hi.", "Huh?"), and
+# the result depends only on these hashable arguments
+@lru_cache(maxsize=4096)
+def _remove_interjections(text: str, finder: _InterjectionIndex,
+                          skip_prefixes: tuple[str, ...], only_separated_lines: bool) -> str:
+    """Remove the interjections indexed by finder from text."""
+    # One scan tells whether any interjection is left at all. The
+    # interjections are still tried in list order below, since which
+    # one is handled first affects the result.
+    candidates = finder.candidates(text)
+    if candidates is None and text.count('\n') != 1:
+        # Nothing to remove, and only two-line text is reshaped below
+        return text
     
-    Faithfully ported from SubtitleEdit's RemoveInterjection.cs
-    """
+    old_text = text
+    newline = '\n' if '\r\n' not in text else '\r\n'
+    nl = _NEWLINE_LITERALS[newline]
+    plain_words = finder.max_hyphens is not None
     
-    def invoke(self, context: InterjectionRemoveContext) -> str:
-        """Remove interjections from the given text."""
-        if not context.text or context.text.isspace():
-            return context.text
-        
-        text = context.text
-        old_text = text
-        newline = '\n' if '\r\n' not in text else '\r\n'
-        
-        do_repeat = True
-        while do_repeat:
-            do_repeat = False
-            for s in context.interjections:
-                if s.lower() in text.lower():
-                    # Case-insensitive word boundary match
-                    regex = re.compile(r'\b' + re.escape(s) + r'\b', re.IGNORECASE)
-                    match = regex.search(text)
-                    if match:
-                        index = match.start()
-                        
-                        from_index_part = text[match.start():]
-                        do_skip = False
-                        for skip_if_starts_with in context.interjections_skip_if_starts_with:
-                            if from_index_part.lower().startswith(skip_if_starts_with.lower()):
-                                do_skip = True
-                                break
-                        if do_skip:
+    do_repeat = candidates is not None
+    while do_repeat:
+        do_repeat = False
+        # Lowercased text, computed once per version of the text
+        lowered = None
+        for s, s_lower in zip(finder.words, finder.words_lower):
+            if s_lower in candidates:
+                # Case-insensitive word boundary match
+                if plain_words and text.isascii():
+                    if lowered is None:
+                        lowered = text.lower()
+                    index = _find_word(lowered, s_lower)
+                    # ASCII lowercasing keeps offsets, so the skip
+                    # prefixes can be tested in place
+                    from_index_part, from_index = lowered, index
+                else:
+                    match = _word_re(s).search(text)
+                    index = match.start() if match else -1
+                    if index >= 0:
+                        from_index_part, from_index = text[index:].lower(), 0
+                if index >= 0:
+                    do_skip = False
+                    for skip_if_starts_with in skip_prefixes:
+                        if from_index_part.startswith(skip_if_starts_with, from_index):
+                            do_skip = True
                             break
-                        
-                        remove_after = True
-                        temp = text[:index] + text[index + len(s):]
-                        
-                        # Handle "... " at start
-                        if index == 0 and temp.startswith('... '):
-                            temp = temp[4:]
-                        
-                        # Handle Spanish punctuation at index 1
-                        if index == 1 and temp.startswith('¿, '):
-                            temp = temp[0] + temp[3:]
-                        
-                        if index == 1 and temp.startswith('¿ '):
-                            temp = temp[0] + temp[2:]
-                        
-                        if index == 1 and temp.startswith('¡, '):
-                            temp = temp[0] + temp[3:]
-                        
-                        if index == 1 and temp.startswith('¡ '):
-                            temp = temp[0] + temp[2:]
-                        
-                        if index == 1 and temp.startswith('... '):
-                            temp = temp[4:]
-                        
-                        if index == 3 and temp.startswith('<i>... '):
-                            temp = temp[:3] + temp[7:]
-                        
-                        if index > 2 and len(temp) >= index - 2 + 5 and temp[index-2:].startswith(', ...'):
-                            temp = temp[:index-2] + temp[index:]
-                            remove_after = False
-                        
-                        if index > 2 and index - 1 < len(text) and text[index-1] in ' \r\n' and len(temp) > index and temp[index:].startswith('... '):
-                            temp = temp[:index] + temp[index+4:]
-                        
-                        if index > 4 and len(temp) > index - 4 and temp[index-4:].startswith('\n<i>... '):
-                            temp = temp[:index] + temp[index+4:]
-                        
-                        if index > 2 and len(temp) >= index - 2 + 3 and temp[index-2:].startswith('? ?'):
-                            temp = temp[:index-2] + temp[index:]
-                            remove_after = False
-                        
-                        if index > 1 and len(temp) >= index - 2 and temp[index-2:] == ', —':
-                            temp = temp[:index-2]
-                        elif index > 2 and len(temp) > index - 2 and temp[index-2:].startswith('. .'):
+                    if do_skip:
+                        break
+                    
+                    remove_after = True
+                    temp = text[:index] + text[index + len(s):]
+                    
+                    # Handle "... ", Spanish punctuation and italics at start
+                    for prefix, keep, drop in _LEADING_FIXES.get(index, ()):
+                        if temp.startswith(prefix):
+                            temp = temp[:keep] + temp[keep + drop:]
+                    
+                    if index > 2 and temp.startswith(', ...', index-2):
+                        temp = temp[:index-2] + temp[index:]
+                        remove_after = False
+                    
+                    if index > 2 and text[index-1] in ' \r\n' and temp.startswith('... ', index):
+                        temp = temp[:index] + temp[index+4:]
+                    
+                    if index > 4 and temp.startswith('\n<i>... ', index-4):
+                        temp = temp[:index] + temp[index+4:]
+                    
+                    if index > 2 and temp.startswith('? ?', index-2):
+                        temp = temp[:index-2] + temp[index:]
+                        remove_after = False
+                    
+                    if index > 1 and temp[index-2:] == ', —':
+                        temp = temp[:index-2]
+                    elif index > 2 and temp.startswith('. .', index-2):
+                        temp = temp[:index-2] + temp[index:]
+                        remove_after = False
+                    elif temp[index:] == ' —' and temp.endswith(('—  —', '-  —')):
+                        temp = temp[:-3]
+                        if temp.endswith((nl.em_dash, nl.dash)):
+                            temp = temp[:-1].rstrip()
+                    elif index == 0 or index == 2:
+                        # Dash and punctuation left at start: first match wins
+                        for prefix, keep, drop in _FIRST_LEADING_FIXES[newline][index]:
+                            if temp.startswith(prefix):
+                                temp = temp[:keep] + temp[keep + drop:]
+                                break
+                    elif index > 3:
+                        # The remaining rules match what follows index - 2;
+                        # its length alone rules out all but one or two
+                        tail = temp[index-2:]
+                        if len(tail) == 4:
+                            if tail in ('.  —', '!  —', '?  —'):
+                                temp = temp[:index-2] + temp[index-1:]
+                                temp = temp.replace('  ', ' ')
+                        elif len(tail) == 3:
+                            if tail in (' ¿?', ' ¡!'):
+                                temp = temp[:index-2]
+                            elif tail[0] in '.!?' and tail[1] == ' ' and tail[2] in '.!?':
+                                temp = temp[:index].rstrip()
+                        elif len(tail) > 4 and tail.startswith(('\n¿? ', '\n¡! ', ' ¿? ', ' ¡! ')):
+                            temp = temp[:index-1] + temp[index+2:]
+                    
+                    pre = ''
+                    if index > 0:
+                        do_repeat = True
+                    
+                    if index > 2 and len(temp) > index:
+                        ending = temp[index-2:index+1]
+                        if ending in (', .', ', !', ', ?', ', …'):
                             temp = temp[:index-2] + temp[index:]
                             remove_after = False
-                        elif len(temp) > index and temp[index:] == ' —' and temp.endswith('—  —'):
-                            temp = temp[:-3]
-                            if temp.endswith(newline + '—'):
-                                temp = temp[:-1].rstrip()
-                        elif len(temp) > index and temp[index:] == ' —' and temp.endswith('-  —'):
-                            temp = temp[:-3]
-                            if temp.endswith(newline + '-'):
-                                temp = temp[:-1].rstrip()
-                        elif index == 2 and temp.startswith('-  —'):
-                            temp = temp[:2] + temp[4:]
-                        elif index == 2 and temp.startswith('- —'):
-                            temp = temp[:2] + temp[3:]
-                        elif index == 2 and temp.startswith(f'- .{newline}'):
-                            temp = temp[:2] + temp[2 + len(f'- .{newline}') - 2:]
-                        elif index == 2 and temp.startswith(f'- !{newline}'):
-                            temp = temp[:2] + temp[2 + len(f'- !{newline}') - 2:]
-                        elif index == 2 and temp.startswith(f'- ?{newline}'):
-                            temp = temp[:2] + temp[2 + len(f'- ?{newline}') - 2:]
-                        elif index == 0 and temp.startswith(' —'):
-                            temp = temp[2:]
-                        elif index == 0 and temp.startswith('—'):
-                            temp = temp[1:]
-                        elif index == 0 and temp.startswith('...! '):
-                            temp = temp[5:]
-                        elif index == 0 and temp.startswith('...? '):
-                            temp = temp[5:]
-                        elif index > 3 and len(temp) >= index - 2 and temp[index-2:] in ('.  —', '!  —', '?  —'):
-                            temp = temp[:index-2] + temp[index-1:]
-                            temp = temp.replace('  ', ' ')
-                        elif index > 3 and len(temp) > index - 2 + 4 and temp[index-2:].startswith('\n¿? '):
-                            temp = temp[:index-1] + temp[index+2:]
-                        elif index > 3 and len(temp) > index - 2 + 4 and temp[index-2:].startswith('\n¡! '):
-                            temp = temp[:index-1] + temp[index+2:]
-                        elif index > 3 and len(temp) > index - 2 + 4 and temp[index-2:].startswith(' ¿? '):
-                            temp = temp[:index-1] + temp[index+2:]
-                        elif index > 3 and len(temp) > index - 2 + 4 and temp[index-2:].startswith(' ¡! '):
-                            temp = temp[:index-1] + temp[index+2:]
-                        elif index > 3 and len(temp) >= index - 2 + 3 and temp[index-2:] == ' ¿?':
-                            temp = temp[:index-2]
-                        elif index > 3 and len(temp) >= index - 2 + 3 and temp[index-2:] == ' ¡!':
-                            temp = temp[:index-2]
-                        elif index > 3 and len(temp) == index + 1 and index - 2 < len(temp) and temp[index-2] in '.!?' and temp[index-1] == ' ' and temp[index] in '.!?':
-                            temp = temp[:index].rstrip()
-                        
-                        pre = ''
-                        if index > 0:
-                            do_repeat = True
-                        
-                        if index > 2 and len(temp) > index:
-                            ending = temp[index-2:index+1]
-                            if ending in (', .', ', !', ', ?', ', …'):
-                                temp = temp[:index-2] + temp[index:]
+                    
+                    if remove_after and index > len(s):
+                        if len(temp) > index - len(s) + 3:
+                            sub_index = index - len(s) + 1
+                            sub_temp = temp[sub_index:sub_index+3]
+                            if sub_temp in (', !', ', ?', ', .'):
+                                temp = temp[:sub_index] + temp[sub_index+2:]
                                 remove_after = False
+                            elif sub_index > 3 and temp[sub_index-1] in '.!?':
+                                sub_temp = temp[sub_index:]
+                                if sub_temp == ' ...' or sub_temp.startswith(nl.ellipsis_before):
+                                    temp = (temp[:sub_index] + temp[sub_index+4:]).strip()
+                                    remove_after = False
                         
-                        if remove_after and index > len(s):
-                            if len(temp) > index - len(s) + 3:
-                                sub_index = index - len(s) + 1
+                        if remove_after and len(temp) > index - len(s) + 2:
+                            sub_index = index - len(s)
+                            if sub_index >= 0 and sub_index + 3 <= len(temp):
                                 sub_temp = temp[sub_index:sub_index+3]
                                 if sub_temp in (', !', ', ?', ', .'):
                                     temp = temp[:sub_index] + temp[sub_index+2:]
                                     remove_after = False
-                                elif sub_index > 3 and sub_index - 1 < len(temp) and temp[sub_index-1] in '.!?':
-                                    sub_temp = temp[sub_index:]
-                                    if sub_temp == ' ...' or sub_temp.startswith(' ...' + newline):
-                                        temp = (temp[:sub_index] + temp[sub_index+4:]).strip()
-                                        remove_after = False
-                            
-                            if remove_after and len(temp) > index - len(s) + 2:
-                                sub_index = index - len(s)
-                                if sub_index >= 0 and sub_index + 3 <= len(temp):
-                                    sub_temp = temp[sub_index:sub_index+3]
-                                    if sub_temp in (', !', ', ?', ', .'):
-                                        temp = temp[:sub_index] + temp[sub_index+2:]
-                                        remove_after = False
-                                    elif sub_temp == ' ¡!':
-                                        temp = temp[:sub_index] + temp[sub_index+3:]
-                                        remove_after = False
-                                    elif sub_temp == ' ¿?':
+                                elif sub_temp in (' ¡!', ' ¿?'):
+                                    temp = temp[:sub_index] + temp[sub_index+3:]
+                                    remove_after = False
+                                elif index == 1 and temp.startswith(nl.inverted_marks_before):
+                                    temp = temp[2:].rstrip()
+                                    remove_after = False
+                                else:
+                                    if temp.startswith(', -—', sub_index):
                                         temp = temp[:sub_index] + temp[sub_index+3:]
                                         remove_after = False
-                                    elif index == 1 and temp.startswith('¿?' + newline):
-                                        temp = temp[2:].rstrip()
+                                    elif temp.startswith(', --', sub_index):
+                                        temp = temp[:sub_index] + temp[sub_index+2:]
                                         remove_after = False
-                                    elif index == 1 and temp.startswith('¡!' + newline):
-                                        temp = temp[2:].rstrip()
+                                    elif index > 2 and temp.startswith('-  —', sub_index):
+                                        temp = temp[:sub_index+2] + temp[sub_index+4:]
+                                        temp = temp.replace('  ', ' ')
                                         remove_after = False
-                                    else:
-                                        sub_temp = temp[sub_index:]
-                                        if sub_temp.startswith(', -—'):
-                                            temp = temp[:sub_index] + temp[sub_index+3:]
-                                            remove_after = False
-                                        elif sub_temp.startswith(', --'):
-                                            temp = temp[:sub_index] + temp[sub_index+2:]
-                                            remove_after = False
-                                        elif index > 2 and sub_temp.startswith('-  —'):
-                                            temp = temp[:sub_index+2] + temp[sub_index+4:]
-                                            temp = temp.replace('  ', ' ')
-                                            remove_after = False
+                        
+                        if remove_after and len(temp) > index - len(s) + 2:
+                            skip_due_to_after_newline = False
+                            if index - len(s) > 2 and temp[index - len(s)] in '\r\n':
+                                skip_due_to_after_newline = True
                             
-                            if remove_after and len(temp) > index - len(s) + 2:
-                                skip_due_to_after_newline = False
-                                if index - len(s) > 2 and index - len(s) < len(temp) and temp[index - len(s)] in '\r\n':
-                                    skip_due_to_after_newline = True
+                            if not skip_due_to_after_newline:
+                                sub_index = index - len(s) + 1
                                 
-                                if not skip_due_to_after_newline:
-                                    sub_index = index - len(s) + 1
+                                if sub_index >= 0:
+                                    sub_temp = temp[sub_index:sub_index+2]
+                                    if sub_temp in ('-!', '-?', '-.'):
+                                        temp = temp[:sub_index] + temp[sub_index+1:]
+                                        remove_after = False
                                     
-                                    if sub_index >= 0 and sub_index + 2 <= len(temp):
-                                        sub_temp = temp[sub_index:sub_index+2]
-                                        if sub_temp in ('-!', '-?', '-.'):
-                                            temp = temp[:sub_index] + temp[sub_index+1:]
-                                            remove_after = False
-                                        
-                                        sub_temp = temp[sub_index:]
-                                        if sub_temp in (' !', ' ?', ' .'):
-                                            temp = temp[:sub_index] + temp[sub_index+1:]
-                                            remove_after = False
-                        
-                        if index > 3 and index - 2 < len(temp):
-                            sub_temp = temp[index-2:]
-                            if sub_temp.startswith(',  —') or sub_temp.startswith(', —'):
-                                temp = temp[:index-2] + temp[index-1:]
-                                index -= 1
-                            
-                            if sub_temp.startswith('- ...'):
-                                remove_after = False
+                                    sub_temp = temp[sub_index:]
+                                    if sub_temp in (' !', ' ?', ' .'):
+                                        temp = temp[:sub_index] + temp[sub_index+1:]
+                                        remove_after = False
+                    
+                    if index > 3 and index - 2 < len(temp):
+                        sub_temp = temp[index-2:]
+                        if sub_temp.startswith((',  —', ', —')):
+                            temp = temp[:index-2] + temp[index-1:]
+                            index -= 1
                         
-                        if index == 1 and temp.startswith('¿?'):
-                            remove_after = False
-                            temp = temp[2:].lstrip()
-                        elif index == 1 and temp.startswith('¡!'):
+                        if sub_temp.startswith('- ...'):
                             remove_after = False
-                            temp = temp[2:].lstrip()
-                        
-                        if remove_after:
-                            if index == 0:
-                                if temp.startswith('-'):
-                                    temp = temp[1:].strip()
-                            elif index == 3 and temp.startswith('<i>-'):
-                                temp = temp[:3] + temp[4:]
-                            elif index > 0 and len(temp) > index:
-                                pre = text[:index]
-                                temp = temp[index:]
-                                
-                                if temp.startswith('-') and pre.endswith('-'):
-                                    temp = temp[1:]
-                                
-                                if temp.startswith('-') and pre.endswith('- '):
-                                    temp = temp[1:]
+                    
+                    if index == 1 and temp.startswith(('¿?', '¡!')):
+                        remove_after = False
+                        temp = temp[2:].lstrip()
+                    
+                    if remove_after:
+                        if index == 0:
+                            if temp.startswith('-'):
+                                temp = temp[1:].strip()
+                        elif index == 3 and temp.startswith('<i>-'):
+                            temp = temp[:3] + temp[4:]
+                        elif index > 0 and len(temp) > index:
+                            pre = text[:index]
+                            temp = temp[index:]
                             
-                            if temp.startswith('...'):
-                                pre = pre.strip()
-                            else:
-                                while len(temp) > 0 and temp[0] in ' ,.?!':
-                                    temp = temp[1:]
-                                    do_repeat = True
-                                
-                                temp = temp.lstrip()
+                            if temp.startswith('-') and pre.endswith('-'):
+                                temp = temp[1:]
                             
-                            pre_no_tags = remove_html_tags(pre, True).strip()
-                            if len(temp) > 0 and (
-                                len(pre_no_tags) == 0 or
-                                pre_no_tags == '-' or
-                                pre_no_tags == '‐' or  # weird dash
-                                pre_no_tags == '' or
-                                pre_no_tags.endswith('¡') or
-                                pre_no_tags.endswith('¿') or
-                                pre_no_tags.endswith('. -') or
-                                pre_no_tags.endswith('! -') or
-                                pre_no_tags.endswith('? -') or
-                                pre_no_tags.endswith(newline + '-') or
-                                (has_sentence_ending(pre_no_tags) and temp[0].lower() == temp[0]) or
-                                temp[0] == '¡' or temp[0] == '¿'
-                            ):
-                                if temp[0] != '¡' and temp[0] != '¿':
-                                    temp = temp[0].upper() + temp[1:]
-                                
-                                if temp[0] == '¡' and len(temp) > 1:
-                                    temp = '¡' + capitalize_first_letter(temp.lstrip('¡'))
-                                elif temp[0] == '¿' and len(temp) > 1:
-                                    temp = '¿' + capitalize_first_letter(temp.lstrip('¿'))
-                                
+                            if temp.startswith('-') and pre.endswith('- '):
+                                temp = temp[1:]
+                        
+                        if temp.startswith('...'):
+                            pre = pre.strip()
+                        else:
+                            while len(temp) > 0 and temp[0] in ' ,.?!':
+                                temp = temp[1:]
                                 do_repeat = True
                             
-                            if temp.startswith('-') and pre.endswith(' '):
-                                temp = temp[1:]
+                            temp = temp.lstrip()
+                        
+                        pre_no_tags = remove_html_tags(pre, True).strip()
+                        if len(temp) > 0 and (
+                            len(pre_no_tags) == 0 or
+                            pre_no_tags == '-' or
+                            pre_no_tags == '‐' or  # weird dash
+                            pre_no_tags == '' or
+                            pre_no_tags.endswith('¡') or
+                            pre_no_tags.endswith('¿') or
+                            pre_no_tags.endswith('. -') or
+                            pre_no_tags.endswith('! -') or
+                            pre_no_tags.endswith('? -') or
+                            pre_no_tags.endswith(nl.dash) or
+                            (has_sentence_ending(pre_no_tags) and temp[0].lower() == temp[0]) or
+                            temp[0] == '¡' or temp[0] == '¿'
+                        ):
+                            if temp[0] != '¡' and temp[0] != '¿':
+                                temp = temp[0].upper() + temp[1:]
                             
-                            if temp.startswith('—') and pre.endswith(','):
-                                pre = pre.rstrip(',') + ' '
+                            if temp[0] == '¡' and len(temp) > 1:
+                                temp = '¡' + capitalize_first_letter(temp.lstrip('¡'))
+                            elif temp[0] == '¿' and len(temp) > 1:
+                                temp = '¿' + capitalize_first_letter(temp.lstrip('¿'))
                             
-                            temp = pre + temp
-                        
-                        if temp.endswith(newline + '- '):
-                            temp = temp[:-2].rstrip()
+                            do_repeat = True
                         
-                        # Check if stripped text is empty (StrippableText equivalent)
-                        stripped = remove_html_tags(temp).strip()
-                        stripped = stripped.strip('♪♫-–—‐…""\'')
-                        if not stripped:
-                            return ''
+                        if temp.startswith('-') and pre.endswith(' '):
+                            temp = temp[1:]
                         
-                        if temp.startswith('-') and newline not in temp and newline in text:
-                            temp = temp[1:].strip()
+                        if temp.startswith('—') and pre.endswith(','):
+                            pre = pre.rstrip(',') + ' '
                         
-                        text = temp
+                        temp = pre + temp
+                    
+                    if temp.endswith(nl.dash_space):
+                        temp = temp[:-2].rstrip()
+                    
+                    # Check if stripped text is empty (StrippableText equivalent)
+                    if _is_effectively_empty(temp):
+                        return ''
+                    
+                    if temp.startswith('-') and newline not in temp and newline in text:
+                        temp = temp[1:].strip()
+                    
+                    text = temp
+                    # Rescanning for whole words after every edit costs more
+                    # than the substring checks left in this pass
+                    lowered = candidates = text.lower()
         
-        line_index_removed = -1
-        lines = split_to_lines(text)
-        if len(lines) == 2 and text != old_text:
-            if lines[0] == '-' and lines[1] == '-':
-                return ''
-            
-            if lines[0] == '- …' and lines[1].startswith('-'):
-                return lines[1][1:].strip()
+        if do_repeat:
+            candidates = finder.candidates(text)
+            do_repeat = candidates is not None
+    
+    line_index_removed = -1
+    lines = split_to_lines(text)
+    if len(lines) == 2 and text != old_text:
+        if lines[0] == '-' and lines[1] == '-':
+            return ''
+        
+        if lines[0] == '- …' and lines[1].startswith('-'):
+            return lines[1][1:].strip()
+        
+        if lines[1] == '- …' and lines[0].startswith('-'):
+            return lines[0][1:].strip()
+        
+        if len(lines[0]) > 1 and lines[0][0] == '-' and lines[1].strip() == '-':
+            old_first_line = split_to_lines(old_text)[0]
+            if only_separated_lines and len(old_first_line) > 1 and old_first_line[0] == '-':
+                lines[0] = old_first_line
+            return lines[0][1:].strip()
+        
+        if len(lines[1]) > 1 and lines[1][0] == '-' and lines[0].strip() == '-':
+            old_second_line = split_to_lines(old_text)[1]
+            if only_separated_lines and len(old_second_line) > 1 and old_second_line[0] == '-':
+                lines[1] = old_second_line
+            return lines[1][1:].strip()
+        
+        if len(lines[1]) > 4 and lines[1].startswith('<i>-') and lines[0].strip() == '-':
+            old_second_line = split_to_lines(old_text)[1]
+            if only_separated_lines and len(old_second_line) > 1 and old_second_line.startswith('<i>-'):
+                lines[1] = old_second_line
+            return '<i>' + lines[1][4:].strip()
+        
+        if len(lines[0]) > 1 and (lines[1] == '-' or lines[1] == '.' or lines[1] == '!' or lines[1] == '?'):
+            old_first_line = split_to_lines(old_text)[0]
+            if only_separated_lines and len(old_first_line) > 1 and (lines[1] == '-' or lines[1] == '.' or lines[1] == '!' or lines[1] == '?'):
+                lines[0] = old_first_line
             
-            if lines[1] == '- …' and lines[0].startswith('-'):
-                return lines[0][1:].strip()
+            if lines[0].startswith('-') and nl.dash in old_text:
+                lines[0] = lines[0][1:]
             
-            if len(lines[0]) > 1 and lines[0][0] == '-' and lines[1].strip() == '-':
-                old_first_line = split_to_lines(old_text)[0]
-                if context.only_separated_lines and len(old_first_line) > 1 and old_first_line[0] == '-':
-                    lines[0] = old_first_line
-                return lines[0][1:].strip()
+            return lines[0].strip()
+        
+        no_tags0 = remove_html_tags(lines[0]).strip()
+        no_tags1 = remove_html_tags(lines[1]).strip()
+        if no_tags0 == '-':
+            if no_tags1 == no_tags0:
+                return ''
             
-            if len(lines[1]) > 1 and lines[1][0] == '-' and lines[0].strip() == '-':
-                old_second_line = split_to_lines(old_text)[1]
-                if context.only_separated_lines and len(old_second_line) > 1 and old_second_line[0] == '-':
-                    lines[1] = old_second_line
+            if len(lines[1]) > 1 and lines[1][0] == '-':
                 return lines[1][1:].strip()
             
-            if len(lines[1]) > 4 and lines[1].startswith('<i>-') and lines[0].strip() == '-':
-                old_second_line = split_to_lines(old_text)[1]
-                if context.only_separated_lines and len(old_second_line) > 1 and old_second_line.startswith('<i>-'):
-                    lines[1] = old_second_line
+            if len(lines[1]) > 4 and lines[1].startswith('<i>-'):
                 return '<i>' + lines[1][4:].strip()
             
-            if len(lines[0]) > 1 and (lines[1] == '-' or lines[1] == '.' or lines[1] == '!' or lines[1] == '?'):
-                old_first_line = split_to_lines(old_text)[0]
-                if context.only_separated_lines and len(old_first_line) > 1 and (lines[1] == '-' or lines[1] == '.' or lines[1] == '!' or lines[1] == '?'):
-                    lines[0] = old_first_line
-                
-                if lines[0].startswith('-') and (newline + '-') in old_text:
-                    lines[0] = lines[0][1:]
-                
-                return lines[0].strip()
+            return lines[1]
+        
+        if no_tags1 == '-':
+            if len(lines[0]) > 1 and lines[0][0] == '-':
+                return lines[0][1:].strip()
             
-            no_tags0 = remove_html_tags(lines[0]).strip()
-            no_tags1 = remove_html_tags(lines[1]).strip()
-            if no_tags0 == '-':
-                if no_tags1 == no_tags0:
-                    return ''
+            if len(lines[0]) > 4 and lines[0].startswith('<i>-'):
+                if '</i>' not in lines[0] and '</i>' in lines[1]:
+                    return '<i>' + lines[0][4:].strip() + '</i>'
                 
-                if len(lines[1]) > 1 and lines[1][0] == '-':
-                    return lines[1][1:].strip()
-                
-                if len(lines[1]) > 4 and lines[1].startswith('<i>-'):
-                    return '<i>' + lines[1][4:].strip()
-                
-                return lines[1]
+                return '<i>' + lines[0][4:].strip()
             
-            if no_tags1 == '-':
-                if len(lines[0]) > 1 and lines[0][0] == '-':
-                    return lines[0][1:].strip()
-                
-                if len(lines[0]) > 4 and lines[0].startswith('<i>-'):
-                    if '</i>' not in lines[0] and '</i>' in lines[1]:
-                        return '<i>' + lines[0][4:].strip() + '</i>'
-                    
-                    return '<i>' + lines[0][4:].strip()
-                
-                return lines[0]
+            return lines[0]
+    
+    if len(lines) == 2:
+        if not lines[1].strip(_LINE_PUNCTUATION_OR_SPACE):
+            text = lines[0]
+            lines = [text]
+            line_index_removed = 1
+        elif not lines[0].strip(_LINE_PUNCTUATION_OR_SPACE):
+            text = lines[1]
+            lines = [text]
+            line_index_removed = 0
+    
+    if len(lines) == 1 and text != old_text and get_number_of_lines(old_text) == 2:
+        if (old_text.startswith(('-', '<i>-')) or nl.dash in old_text or nl.italic_dash in old_text) and any(
+                end in old_text for end in nl.sentence_breaks):
+            if text.startswith('<i>-'):
+                text = '<i>' + text[4:].lstrip()
+            else:
+                text = text.lstrip('-').lstrip()
+    
+    if old_text != text:
+        text = text.replace(nl.italic_between, nl.italic_after)
+        text = text.replace(nl.end_italic_between, nl.end_italic_before)
+        if text.startswith(nl.italic_before):
+            text = '<i>' + text[3 + len(newline):]
         
-        if len(lines) == 2:
-            if not remove_chars(lines[1], '.', '?', '!', '-', '—').strip():
-                text = lines[0]
-                lines = split_to_lines(text)
-                line_index_removed = 1
-            elif not remove_chars(lines[0], '.', '?', '!', '-', '—').strip():
-                text = lines[1]
-                lines = split_to_lines(text)
-                line_index_removed = 0
+        if text.endswith(nl.end_italic_after):
+            text = text[:-(len(newline) + 4)] + '</i>'
         
-        if len(lines) == 1 and text != old_text and get_number_of_lines(old_text) == 2:
-            if (old_text.startswith('-') or old_text.startswith('<i>-')) and (
-                '.' + newline in old_text or '.</i>' + newline in old_text or
-                '!' + newline in old_text or '!</i>' + newline in old_text or
-                '?' + newline in old_text or '?</i>' + newline in old_text):
-                if text.startswith('<i>-'):
-                    text = '<i>' + text[4:].lstrip()
-                else:
-                    text = text.lstrip('-').lstrip()
-            elif ((newline + '-') in old_text or (newline + '<i>-') in old_text) and (
-                '.' + newline in old_text or '.</i>' + newline in old_text or
-                '!' + newline in old_text or '!</i>' + newline in old_text or
-                '?' + newline in old_text or '?</i>' + newline in old_text):
-                if text.startswith('<i>-'):
-                    text = '<i>' + text[4:].lstrip()
-                else:
-                    text = text.lstrip('-').lstrip()
+        text = text.replace(nl.end_italic_between, nl.end_italic_before)
         
-        if old_text != text:
-            text = text.replace(newline + '<i>' + newline, newline + '<i>')
-            text = text.replace(newline + '</i>' + newline, '</i>' + newline)
-            if text.startswith('<i>' + newline):
-                text = '<i>' + text[3 + len(newline):]
+        if only_separated_lines:
+            if not text:
+                return text
             
-            if text.endswith(newline + '</i>'):
-                text = text[:-(len(newline) + 4)] + '</i>'
+            old_lines = split_to_lines(old_text)
+            new_lines = split_to_lines(text)
+            if len(old_lines) == 2 and len(new_lines) == 1 and (
+                old_lines[0].lstrip(' -') == new_lines[0] or 
+                old_lines[1].lstrip(' -') == new_lines[0]):
+                return text
             
-            text = text.replace(newline + '</i>' + newline, '</i>' + newline)
+            if line_index_removed == 0:
+                return _remove_start_dash_single_line(old_lines[1])
             
-            if context.only_separated_lines:
-                if not text:
-                    return text
-                
-                old_lines = split_to_lines(old_text)
-                new_lines = split_to_lines(text)
-                if len(old_lines) == 2 and len(new_lines) == 1 and (
-                    old_lines[0].lstrip(' -') == new_lines[0] or 
-                    old_lines[1].lstrip(' -') == new_lines[0]):
-                    return text
-                
-                if line_index_removed == 0:
-                    return self._remove_start_dash_single_line(old_lines[1])
-                
-                if line_index_removed == 1:
-                    return self._remove_start_dash_single_line(old_lines[0])
-                
-                return old_text
-        
-        if '  ' not in old_text:
-            while '  ' in text:
-                text = text.replace('  ', ' ')
-        
-        return text
+            if line_index_removed == 1:
+                return _remove_start_dash_single_line(old_lines[0])
+            
+            return old_text
     
-    def _remove_start_dash_single_line(self, input_text: str) -> str:
-        """Remove starting dash from a single line."""
-        if not input_text:
-            return input_text
-        
-        s = input_text
-        if s[0] == '-':
-            return s.lstrip('-').lstrip()
-        
-        pre = ''
-        if s.startswith('{\\') and '}' in s:
-            idx = s.index('}')
-            pre = s[:idx + 1]
-            s = s[idx + 1:].lstrip()
+    if '  ' not in old_text and '  ' in text:
+        text = _MULTI_SPACE_RE.sub(' ', text)
+    
+    return text
+
+
+def _remove_start_dash_single_line(input_text: str) -> str:
+    """Remove starting dash from a single line."""
+    if not input_text:
+        return input_text
+    
+    s = input_text
+    if s[0] == '-':
+        return s.lstrip('-').lstrip()
+    
+    pre = ''
+    if s.startswith('{\\') and '}' in s:
+        idx = s.index('}')
+        pre = s[:idx + 1]
+        s = s[idx + 1:].lstrip()
+    
+    if s.lower().startswith('<i>'):
+        pre += '<i>'
+        s = s[3:].lstrip()
+    
+    if s.lower().startswith('<font>'):
+        pre += '<font>'
+        s = s[6:].lstrip()
+    
+    return pre + s.lstrip('-').lstrip()
+
+
+class RemoveInterjection:
+    """Remove interjection words from subtitle text.
+    
+    Faithfully ported from SubtitleEdit's RemoveInterjection.cs
+    """
+    
+    def __init__(
+        self,
+        interjections: Optional[list[str]] = None,
+        interjections_skip_if_starts_with: Optional[list[str]] = None,
+    ):
+        """Resolve the word lists used by remove() once.
         
-        if s.lower().startswith('<i>'):
-            pre += '<i>'
-            s = s[3:].lstrip()
+        Args:
+            interjections: Words to remove (default: INTERJECTIONS_EN).
+            interjections_skip_if_starts_with: Words that keep a match when
+                the text continues with them (default: INTERJECTIONS_SKIP_EN).
+        """
+        if interjections is None:
+            interjections = INTERJECTIONS_EN
+        if interjections_skip_if_starts_with is None:
+            interjections_skip_if_starts_with = INTERJECTIONS_SKIP_EN
+        # Snapshots: later changes to the lists don't affect remove()
+        self._finder = _interjection_index(tuple(interjections))
+        self._skip_prefixes = _lowered_words(tuple(interjections_skip_if_starts_with))
+        # invoke(): copies of the last context's word lists and what they resolved to
+        self._invoke_lists: Optional[tuple] = None
+    
+    def remove(self, text: str, only_separated_lines: bool = False) -> str:
+        """Remove the constructor's interjections from text.
         
-        if s.lower().startswith('<font>'):
-            pre += '<font>'
-            s = s[6:].lstrip()
+        Same as invoke() with a context carrying those word lists, without
+        re-resolving them for every subtitle.
+        """
+        if not text or text.isspace():
+            return text
+        return _remove_interjections(text, self._finder, self._skip_prefixes, only_separated_lines)
+    
+    def invoke(self, context: InterjectionRemoveContext) -> str:
+        """Remove interjections from the given text."""
+        if not context.text or context.text.isspace():
+            return context.text
         
-        return pre + s.lstrip('-').lstrip()
+        # Callers usually pass the same lists for every cue. Comparing them
+        # with copies from the last call is far cheaper than hashing them
+        # again for the index caches, and still notices in-place changes.
+        resolved = self._invoke_lists
+        if (resolved is None or context.interjections != resolved[0]
+                or context.interjections_skip_if_starts_with != resolved[1]):
+            interjections = list(context.interjections)
+            skip = list(context.interjections_skip_if_starts_with)
+            resolved = self._invoke_lists = (
+                interjections, skip,
+                _interjection_index(tuple(interjections)), _lowered_words(tuple(skip)),
+            )
+        return _remove_interjections(context.text, resolved[2], resolved[3],
+                                     context.only_separated_lines)
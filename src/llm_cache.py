@@ -0,0 +1,99 @@
+"""Persistent cache for LLM shortening results.
+
+Stores shortened texts in a SQLite file so that re-running the optimizer on
+the same subtitles doesn't query the model again for segments it has
+already shortened.
+"""
+
+import hashlib
+import json
+import sqlite3
+from typing import Iterable
+
+from .llm_shortener import _PROMPT_CONTEXT_CHARS, HighCPSSegment
+
+
+class LLMCache:
+    """SQLite-backed map from (model, segment) to shortened text.
+
+    A segment is identified by everything the prompt tells the model about
+    it: its original text, the number of characters it had to lose, the
+    (truncated) surrounding lines and whether the next line starts
+    uppercase. A different target CPS or context is a cache miss.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the cache file.
+
+        Args:
+            path: SQLite database path; ":memory:" for a throwaway cache.
+        """
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS shortened (key TEXT PRIMARY KEY, text TEXT NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(model: str, segment: HighCPSSegment) -> str:
+        """Cache key for a segment shortened by a model."""
+        # A JSON array can't be confused with another tuple of values, unlike
+        # fields joined by a separator that may also occur inside them
+        source = json.dumps([
+            model,
+            segment.original_text,
+            segment.chars_to_reduce,
+            segment.next_is_uppercase,
+            # Same truncation as build_shortening_prompt()
+            segment.context_before[:_PROMPT_CONTEXT_CHARS],
+            segment.context_after[:_PROMPT_CONTEXT_CHARS],
+        ])
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def fill(self, model: str, segments: Iterable[HighCPSSegment]) -> list[HighCPSSegment]:
+        """Fill in shortened_text for cached segments.
+
+        Args:
+            model: Model name the results were produced with.
+            segments: Segments to look up.
+
+        Returns:
+            The segments that were not in the cache.
+        """
+        misses = []
+        for seg in segments:
+            row = self._conn.execute(
+                'SELECT text FROM shortened WHERE key = ?', (self.key(model, seg),)
+            ).fetchone()
+            if row is None:
+                misses.append(seg)
+            else:
+                seg.shortened_text = row[0]
+        return misses
+
+    def store(self, model: str, segments: Iterable[HighCPSSegment]) -> None:
+        """Save the shortened_text of segments that have one.
+
+        Args:
+            model: Model name the results were produced with.
+            segments: Segments whose results to save.
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO shortened (key, text) VALUES (?, ?)',
+                [
+                    (self.key(model, seg), seg.shortened_text)
+                    for seg in segments
+                    if seg.shortened_text is not None
+                ],
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> 'LLMCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -4,15 +4,45 @@ Handles Gemini API integration for shortening high-CPS subtitle segments.
 """
 
 import json
+import random
 import re
 import time
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union
 
-from .srt_processor import SubtitleEntry, calculate_cps
+from .srt_processor import SubtitleBatch, SubtitleEntry
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used instead
+    orjson = None
 
-@dataclass
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+if TYPE_CHECKING:
+    from .llm_cache import LLMCache
+
+
+# Outermost [...] in a model response (may be wrapped in markdown fences)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# "Retry-After: 30" / "retry after 30" / "Please retry in 23.4s" in an error
+_RETRY_AFTER_RE = re.compile(r'retry[ _-]?(?:after|in)\W*(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+# Upper bound for a single rate-limit wait, in seconds
+_MAX_RETRY_DELAY = 60.0
+
+# Letter candidates; also matches a few numeric characters (e.g. "²")
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
+# Characters checked one by one before switching to _LETTER_RE
+_LETTER_SCAN_PREFIX = 16
+
+
+@dataclass(slots=True)
 class HighCPSSegment:
     """A subtitle segment that needs LLM shortening."""
     index: int
@@ -26,50 +56,64 @@ class HighCPSSegment:
     shortened_text: Optional[str] = None
 
 
+def _first_letter_is_upper(text: str) -> bool:
+    """Whether the first letter of text is uppercase (True if it has none)."""
+    # The first letter is usually within a few characters ("- ", "<i>"),
+    # where a plain loop beats a regex call; long runs of symbols ("♪ ♪ ♪")
+    # are left to the C-level search
+    for char in text[:_LETTER_SCAN_PREFIX]:
+        if char.isalpha():
+            return char.isupper()
+    match = _LETTER_RE.search(text, _LETTER_SCAN_PREFIX)
+    while match and not match.group().isalpha():
+        match = _LETTER_RE.search(text, match.end())
+    return match.group().isupper() if match else True
+
+
 def find_high_cps_segments(
-    subtitles: list[SubtitleEntry],
+    subtitles: Union[list[SubtitleEntry], SubtitleBatch],
     target_cps: float = 21.0,
     min_reduction: int = 6
 ) -> list[HighCPSSegment]:
     """Find subtitle segments that need LLM shortening.
     
     Args:
-        subtitles: List of subtitle entries.
+        subtitles: List of subtitle entries, or a SubtitleBatch.
         target_cps: Target CPS value.
         min_reduction: Minimum characters to reduce to be worth LLM processing.
         
     Returns:
         List of HighCPSSegment objects needing shortening.
     """
+    if isinstance(subtitles, SubtitleBatch):
+        return _find_high_cps_in_batch(subtitles, target_cps, min_reduction)
+    
     segments = []
+    last = len(subtitles) - 1
     
-    for i, sub in enumerate(subtitles):
-        cps = calculate_cps(sub)
-        
-        if cps <= target_cps or cps == float('inf'):
-            continue
+    # Pick the candidates in one comprehension over the cached CPS values;
+    # only those go through the per-segment work below
+    inf = float('inf')
+    candidates = [i for i, sub in enumerate(subtitles) if target_cps < sub.cps != inf]
+    
+    for i in candidates:
+        sub = subtitles[i]
+        cps = sub.cps
         
-        # Calculate how many chars need to be reduced
-        duration = sub.duration
-        current_chars = sub.char_count
-        target_chars = int(target_cps * duration)
-        chars_to_reduce = current_chars - target_chars
+        # Calculate how many chars need to be reduced (same arithmetic as
+        # sub.duration, from the cached integer times)
+        duration = (sub.end_us - sub.start_us) / 1_000_000
+        chars_to_reduce = sub.char_count - int(target_cps * duration)
         
         if chars_to_reduce < min_reduction:
             continue
         
         # Get context
-        context_before = subtitles[i - 1].text if i > 0 else ""
-        context_after = subtitles[i + 1].text if i + 1 < len(subtitles) else ""
+        context_before = subtitles[i - 1].text if i else ""
+        context_after = subtitles[i + 1].text if i < last else ""
         
         # Determine if next text starts with uppercase (for punctuation rule)
-        next_is_uppercase = True
-        if context_after:
-            # Find first letter in context_after
-            for char in context_after:
-                if char.isalpha():
-                    next_is_uppercase = char.isupper()
-                    break
+        next_is_uppercase = _first_letter_is_upper(context_after)
         
         segment = HighCPSSegment(
             index=sub.index,
@@ -86,16 +130,43 @@ def find_high_cps_segments(
     return segments
 
 
-def build_shortening_prompt(segments: list[HighCPSSegment]) -> str:
-    """Build a prompt for Gemini API to shorten segments.
+def _find_high_cps_in_batch(
+    batch: SubtitleBatch,
+    target_cps: float,
+    min_reduction: int
+) -> list[HighCPSSegment]:
+    """find_high_cps_segments() reading the batch's columns."""
+    segments = []
+    texts, starts_us, ends_us = batch.texts, batch.starts_us, batch.ends_us
+    last = len(texts) - 1
+    all_cps = batch.cps()
     
-    Args:
-        segments: List of segments to shorten.
+    inf = float('inf')
+    for i in [i for i, cps in enumerate(all_cps) if target_cps < cps != inf]:
+        duration = (ends_us[i] - starts_us[i]) / 1_000_000
+        chars_to_reduce = batch.char_counts[i] - int(target_cps * duration)
+        if chars_to_reduce < min_reduction:
+            continue
         
-    Returns:
-        Prompt string for LLM.
-    """
-    prompt = """You are a professional subtitle editor. Shorten the following subtitle texts to meet character limits while keeping the meaning intact.
+        context_after = texts[i + 1] if i < last else ""
+        segments.append(HighCPSSegment(
+            index=batch.indexes[i],
+            original_text=texts[i],
+            current_cps=all_cps[i],
+            target_cps=target_cps,
+            chars_to_reduce=chars_to_reduce,
+            context_before=texts[i - 1] if i else "",
+            context_after=context_after,
+            next_is_uppercase=_first_letter_is_upper(context_after),
+        ))
+    
+    return segments
+
+
+# Characters of each neighbouring line included in the prompt
+_PROMPT_CONTEXT_CHARS = 50
+
+_PROMPT_HEADER = """You are a professional subtitle editor. Shorten the following subtitle texts to meet character limits while keeping the meaning intact.
 
 Rules:
 1. Keep the core meaning intact
@@ -107,12 +178,30 @@ Rules:
 
 Segments to shorten:
 """
+
+_PROMPT_FOOTER = """
+Return JSON array like: [{"index": 1, "text": "shortened text"}, ...]
+"""
+
+
+def build_shortening_prompt(segments: list[HighCPSSegment]) -> str:
+    """Build a prompt for Gemini API to shorten segments.
     
+    Args:
+        segments: List of segments to shorten.
+        
+    Returns:
+        Prompt string for LLM.
+    """
+    # Parts are joined once instead of growing the prompt segment by segment
+    parts = [_PROMPT_HEADER]
     for seg in segments:
         char_count = len(seg.original_text.replace('\n', '').replace('\r', ''))
-        context_before = seg.context_before[:50] + "..." if seg.context_before else "(start)"
-        context_after = seg.context_after[:50] + "..." if seg.context_after else "(end)"
-        prompt += f"""
+        context_before = (seg.context_before[:_PROMPT_CONTEXT_CHARS] + "..."
+                          if seg.context_before else "(start)")
+        context_after = (seg.context_after[:_PROMPT_CONTEXT_CHARS] + "..."
+                         if seg.context_after else "(end)")
+        parts.append(f"""
 ---
 Index: {seg.index}
 Original ({char_count} chars, need to reduce by {seg.chars_to_reduce}): "{seg.original_text}"
@@ -120,39 +209,31 @@ Context before: "{context_before}"
 Context after: "{context_after}"
 next_is_uppercase: {seg.next_is_uppercase}
 ---
-"""
-    
-    prompt += """
-Return JSON array like: [{"index": 1, "text": "shortened text"}, ...]
-"""
-    
-    return prompt
+""")
+    parts.append(_PROMPT_FOOTER)
+    return ''.join(parts)
 
 
-def shorten_with_llm(
-    segments: list[HighCPSSegment],
-    api_key: str,
-    model: str = "gemini-2.5-flash",
-    max_retries: int = 3
-) -> list[HighCPSSegment]:
-    """Call Gemini API to shorten segments.
+def _shorten_batch(
+    client,
+    batch: list[HighCPSSegment],
+    model: str,
+    max_retries: int
+) -> None:
+    """Send one batch of segments to Gemini and fill in shortened_text.
+    
+    Segments the model answers are claimed; when a reply leaves some out,
+    the remaining attempts re-prompt only those, so answered segments are
+    never sent twice.
     
     Args:
-        segments: List of segments to shorten.
-        api_key: Gemini API key.
+        client: genai.Client to send the request with.
+        batch: Segments to shorten in a single prompt.
         model: Model name.
         max_retries: Maximum retry attempts.
-        
-    Returns:
-        Segments with shortened_text filled in.
     """
-    try:
-        from google import genai
-    except ImportError:
-        raise ImportError("google-genai package required. Install with: pip install google-genai")
-    
-    client = genai.Client(api_key=api_key)
-    prompt = build_shortening_prompt(segments)
+    pending = batch
+    prompt = build_shortening_prompt(pending)
     
     for attempt in range(max_retries):
         try:
@@ -162,43 +243,178 @@ def shorten_with_llm(
             )
             
             # Parse JSON response
-            text = response.text
-            # Extract JSON from response (might be wrapped in markdown)
-            json_match = re.search(r'\[.*\]', text, re.DOTALL)
-            if json_match:
-                results = json.loads(json_match.group())
-                
+            results = _parse_json_array(response.text)
+            if results is not None:
                 # Apply results to segments
-                result_map = {r['index']: r['text'] for r in results}
-                for seg in segments:
+                result_map = {
+                    r['index']: r['text'] for r in results
+                    if isinstance(r, dict) and 'index' in r and 'text' in r
+                }
+                missing = []
+                for seg in pending:
                     if seg.index in result_map:
                         seg.shortened_text = result_map[seg.index]
+                    else:
+                        missing.append(seg)
                 
-                return segments
+                if not missing or len(missing) == len(pending):
+                    return
+                pending = missing
+                prompt = build_shortening_prompt(pending)
             
         except Exception as e:
             if 'rate' in str(e).lower() or '429' in str(e):
-                # Rate limit - exponential backoff
-                wait_time = 2 ** attempt
-                time.sleep(wait_time)
+                time.sleep(_retry_delay(e, attempt))
             elif attempt == max_retries - 1:
                 raise
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait after a rate-limit error.
+    
+    Uses the server's Retry-After hint when the error carries one (as a
+    response header or in its message), otherwise exponential backoff with
+    jitter so concurrent batches don't retry in lockstep.
+    
+    Args:
+        error: The rate-limit exception.
+        attempt: Zero-based attempt number.
+        
+    Returns:
+        Delay in seconds, at most _MAX_RETRY_DELAY.
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    hint = None
+    if headers:
+        hint = headers.get('Retry-After') or headers.get('retry-after')
+    if hint is None:
+        match = _RETRY_AFTER_RE.search(str(error))
+        if match:
+            hint = match.group(1)
+    
+    if hint is not None:
+        try:
+            return min(float(hint), _MAX_RETRY_DELAY)
+        except ValueError:
+            # HTTP-date form; fall back to backoff
+            pass
+    
+    return min(2 ** attempt + random.uniform(0, 0.5), _MAX_RETRY_DELAY)
+
+
+@lru_cache(maxsize=4)
+def _client(genai, api_key: str):
+    """Shared genai.Client per API key, reused across calls."""
+    return genai.Client(api_key=api_key)
+
+
+def shorten_with_llm(
+    segments: list[HighCPSSegment],
+    api_key: str,
+    model: str = "gemini-2.5-flash",
+    max_retries: int = 3,
+    batch_size: int = 20,
+    max_workers: int = 4,
+    cache: Optional['LLMCache'] = None
+) -> list[HighCPSSegment]:
+    """Call Gemini API to shorten segments.
+    
+    Segments are sent in batches of batch_size, with up to max_workers
+    requests in flight at once. Smaller prompts stay within context limits
+    and their latencies overlap instead of adding up.
+    
+    Args:
+        segments: List of segments to shorten.
+        api_key: Gemini API key.
+        model: Model name.
+        max_retries: Maximum retry attempts per batch.
+        batch_size: Maximum segments per request.
+        max_workers: Maximum concurrent requests.
+        cache: Optional LLMCache; cached segments are not sent to the model
+            and new results are added to it.
+        
+    Returns:
+        Segments with shortened_text filled in.
+    """
+    pending = segments
+    if cache is not None:
+        pending = cache.fill(model, segments)
+        if not pending:
+            return segments
+    
+    try:
+        from google import genai
+    except ImportError:
+        raise ImportError("google-genai package required. Install with: pip install google-genai")
+    
+    client = _client(genai, api_key)
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    
+    try:
+        if len(batches) <= 1 or max_workers <= 1:
+            for batch in batches:
+                _shorten_batch(client, batch, model, max_retries)
+            return segments
+        
+        # Imported here like genai: concurrent.futures pulls in logging,
+        # which runs that never reach the model don't need
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            futures = [
+                executor.submit(_shorten_batch, client, batch, model, max_retries)
+                for batch in batches
+            ]
+            for future in futures:
+                # Re-raises the first batch failure
+                future.result()
+    finally:
+        # Keep whatever batches completed, even if another one failed
+        if cache is not None:
+            cache.store(model, pending)
     
     return segments
 
 
+def _parse_json_array(text: str) -> Optional[list]:
+    """Extract the JSON array from an LLM response.
+    
+    Args:
+        text: Response text, either bare JSON or wrapped in markdown.
+        
+    Returns:
+        The decoded list, or None if the response contains no array.
+    """
+    # Bare JSON is the common case and needs no regex scan
+    try:
+        results = _json_loads(text)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(results, list):
+            return results
+    
+    json_match = _JSON_ARRAY_RE.search(text)
+    if json_match:
+        return _json_loads(json_match.group())
+    return None
+
+
 def apply_shortened_text(
-    subtitles: list[SubtitleEntry],
+    subtitles: Union[list[SubtitleEntry], SubtitleBatch],
     segments: list[HighCPSSegment]
-) -> list[SubtitleEntry]:
+) -> Union[list[SubtitleEntry], SubtitleBatch]:
     """Apply shortened text from LLM to subtitles.
     
+    A SubtitleBatch is updated in place: only the rows that were shortened
+    are written, and the same batch is returned.
+    
     Args:
-        subtitles: Original subtitle list.
+        subtitles: Original subtitle list, or a SubtitleBatch.
         segments: Segments with shortened_text filled in.
         
     Returns:
-        Updated subtitle list.
+        Updated subtitle list (or the updated batch).
     """
     # Create a map of index -> shortened text
     shortened_map = {
@@ -207,72 +423,118 @@ def apply_shortened_text(
         if seg.shortened_text is not None
     }
     
+    if isinstance(subtitles, SubtitleBatch):
+        if shortened_map:
+            set_text = subtitles.set_text
+            for i, index in enumerate(subtitles.indexes):
+                if index in shortened_map:
+                    set_text(i, shortened_map[index])
+        return subtitles
+    
+    if not shortened_map:
+        return subtitles.copy()
+    
+    # Untouched entries are reused as-is; only rewritten ones are copied
     result = []
     for sub in subtitles:
         if sub.index in shortened_map:
-            new_sub = SubtitleEntry(
-                index=sub.index,
-                start=sub.start,
-                end=sub.end,
-                text=shortened_map[sub.index]
-            )
-            result.append(new_sub)
+            result.append(sub.with_text(shortened_map[sub.index]))
         else:
             result.append(sub)
     
     return result
 
 
-def export_segments_json(segments: list[HighCPSSegment], path: str) -> None:
+def export_segments_json(segments: list[HighCPSSegment], path: Union[str, BinaryIO]) -> None:
     """Export high-CPS segments to JSON for manual LLM processing.
     
     Args:
         segments: List of segments.
-        path: Output JSON file path.
+        path: Output JSON file path, or a binary file object to write the
+            UTF-8 JSON to (it is left open).
     """
-    data = []
-    for seg in segments:
-        data.append({
-            'index': seg.index,
-            'original_text': seg.original_text,
-            'current_cps': round(seg.current_cps, 2),
-            'target_cps': seg.target_cps,
-            'chars_to_reduce': seg.chars_to_reduce,
-            'context_before': seg.context_before[:100] if seg.context_before else "",
-            'context_after': seg.context_after[:100] if seg.context_after else "",
-            'next_is_uppercase': seg.next_is_uppercase,
-            'shortened_text': seg.shortened_text,
-        })
-    
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-
-def load_segments_json(path: str) -> list[HighCPSSegment]:
+    with _open_binary(path, 'wb') as f:
+        if orjson is not None:
+            # Same layout as json.dump(..., indent=2), encoded straight to UTF-8
+            f.write(orjson.dumps([_segment_to_item(seg) for seg in segments],
+                                 option=orjson.OPT_INDENT_2))
+            return
+        
+        if not segments:
+            f.write(b'[]')
+            return
+        
+        # Written one segment at a time, laid out exactly like
+        # json.dump(..., indent=2) of the whole list
+        separator = '[\n  '
+        for seg in segments:
+            item = json.dumps(_segment_to_item(seg), ensure_ascii=False, indent=2)
+            f.write((separator + item.replace('\n', '\n  ')).encode('utf-8'))
+            separator = ',\n  '
+        f.write(b'\n]')
+
+
+def _open_binary(path: Union[str, BinaryIO], mode: str):
+    """Open path in binary mode, or pass a file object through unclosed."""
+    if hasattr(path, 'read' if 'r' in mode else 'write'):
+        return nullcontext(path)
+    return open(path, mode)
+
+
+def _segment_to_item(seg: HighCPSSegment) -> dict:
+    """JSON object for an exported segment."""
+    return {
+        'index': seg.index,
+        'original_text': seg.original_text,
+        'current_cps': round(seg.current_cps, 2),
+        'target_cps': seg.target_cps,
+        'chars_to_reduce': seg.chars_to_reduce,
+        'context_before': seg.context_before[:100] if seg.context_before else "",
+        'context_after': seg.context_after[:100] if seg.context_after else "",
+        'next_is_uppercase': seg.next_is_uppercase,
+        'shortened_text': seg.shortened_text,
+    }
+
+
+def load_segments_json(path: Union[str, BinaryIO]) -> list[HighCPSSegment]:
     """Load segments from JSON file (after manual LLM processing).
     
     Args:
-        path: JSON file path.
+        path: JSON file path, or a binary file object to read from.
         
     Returns:
         List of HighCPSSegment objects.
     """
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    segments = []
-    for item in data:
-        seg = HighCPSSegment(
-            index=item['index'],
-            original_text=item['original_text'],
-            current_cps=item['current_cps'],
-            target_cps=item['target_cps'],
-            chars_to_reduce=item['chars_to_reduce'],
-            context_before=item.get('context_before', ''),
-            context_after=item.get('context_after', ''),
-            next_is_uppercase=item.get('next_is_uppercase', True),
-            shortened_text=item.get('shortened_text'),
-        )
-        segments.append(seg)
+    with _open_binary(path, 'rb') as f:
+        if orjson is not None:
+            data = orjson.loads(f.read())
+        else:
+            # Segments are built while parsing, so no list of dicts is kept
+            data = json.load(f, object_hook=_segment_hook)
     
-    return segments
+    return [
+        item if isinstance(item, HighCPSSegment) else _segment_from_item(item)
+        for item in data
+    ]
+
+
+def _segment_from_item(item: dict) -> HighCPSSegment:
+    """Build a HighCPSSegment from an exported JSON object."""
+    # Positional in field order; keyword passing is measurably slower per call
+    get = item.get
+    return HighCPSSegment(
+        item['index'],
+        item['original_text'],
+        item['current_cps'],
+        item['target_cps'],
+        item['chars_to_reduce'],
+        get('context_before', ''),
+        get('context_after', ''),
+        get('next_is_uppercase', True),
+        get('shortened_text'),
+    )
+
+
+def _segment_hook(item: dict):
+    """json object_hook turning exported segments into HighCPSSegment."""
+    return _segment_from_item(item) if 'original_text' in item else item
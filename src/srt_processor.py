@@ -5,35 +5,209 @@ Handles reading, writing, and analysis of SRT subtitle files.
 
 import os
 import re
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import NamedTuple
+from typing import Iterator, NamedTuple, Optional, Union
 
-import pysrt
 
+_ONE_US = timedelta(microseconds=1)
+_INF = float('inf')
 
-@dataclass
+# "HH:MM:SS,mmm --> HH:MM:SS,mmm" time line, as written by virtually every
+# tool; anything else is left to pysrt
+_TIME_LINE_RE = re.compile(
+    r'\s*(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)')
+
+
+def _char_count(text: str) -> int:
+    """Number of characters excluding line breaks."""
+    # Two replace() calls beat len() minus two count() calls on cue-sized
+    # text: replace() returns the same string when the char is absent
+    return len(text.replace('\n', '').replace('\r', ''))
+
+
+def _cps(char_count: int, start_us: int, end_us: int) -> float:
+    """Characters per second, or infinity for zero or negative duration."""
+    duration = (end_us - start_us) / 1_000_000
+    return char_count / duration if duration > 0 else float('inf')
+
+
+@dataclass(frozen=True, slots=True)
 class SubtitleEntry:
-    """Represents a single subtitle entry."""
+    """Represents a single subtitle entry.
+    
+    Entries are immutable; derived values are computed once on construction.
+    Use dataclasses.replace() to get a modified copy, or with_end(),
+    with_text(), with_index() and merged_with() to change a single field
+    without recomputing the values that don't depend on it.
+    """
     index: int
     start: timedelta
     end: timedelta
     text: str
+    # Start/end in integer microseconds
+    start_us: int = field(init=False, repr=False, compare=False)
+    end_us: int = field(init=False, repr=False, compare=False)
+    # Character count excluding newlines
+    char_count: int = field(init=False, repr=False, compare=False)
+    # Number of lines in the text
+    line_count: int = field(init=False, repr=False, compare=False)
+    # Characters per second (infinity for zero or negative duration)
+    cps: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        text = self.text
+        start_us = self.start // _ONE_US
+        end_us = self.end // _ONE_US
+        char_count = _char_count(text)
+        _set_start_us(self, start_us)
+        _set_end_us(self, end_us)
+        _set_char_count(self, char_count)
+        _set_line_count(self, text.count('\n') + 1)
+        _set_cps(self, _cps(char_count, start_us, end_us))
+    
+    def with_end(self, end: timedelta) -> 'SubtitleEntry':
+        """Return a copy with a different end time.
+        
+        Unlike dataclasses.replace(), the text-derived values are reused
+        instead of being recomputed.
+        """
+        end_us = end // _ONE_US
+        return _make_entry(self.index, self.start, end, self.text, self.start_us, end_us,
+                           self.char_count, self.line_count,
+                           _cps(self.char_count, self.start_us, end_us))
+    
+    def with_text(self, text: str) -> 'SubtitleEntry':
+        """Return a copy with different text, reusing the timing values."""
+        char_count = _char_count(text)
+        return _make_entry(self.index, self.start, self.end, text, self.start_us, self.end_us,
+                           char_count, text.count('\n') + 1,
+                           _cps(char_count, self.start_us, self.end_us))
+    
+    def with_index(self, index: int) -> 'SubtitleEntry':
+        """Return a copy with a different index, reusing all derived values."""
+        return _make_entry(index, self.start, self.end, self.text, self.start_us, self.end_us,
+                           self.char_count, self.line_count, self.cps)
+    
+    def merged_with(self, other: 'SubtitleEntry', end: Optional[timedelta] = None) -> 'SubtitleEntry':
+        """Return this entry joined with the one after it.
+        
+        The texts are joined by a newline and the counts of both entries
+        are added up instead of being recomputed from the joined text.
+        
+        Args:
+            other: The following entry.
+            end: End time of the result (default: the end of other).
+        """
+        if end is None:
+            end, end_us = other.end, other.end_us
+        else:
+            end_us = end // _ONE_US
+        char_count = self.char_count + other.char_count
+        return _make_entry(self.index, self.start, end, '\n'.join((self.text, other.text)),
+                           self.start_us, end_us, char_count,
+                           self.line_count + other.line_count,
+                           _cps(char_count, self.start_us, end_us))
     
     @property
     def duration(self) -> float:
         """Duration in seconds."""
-        return (self.end - self.start).total_seconds()
+        return (self.end_us - self.start_us) / 1_000_000
+
+
+# Slot descriptors' setters: they store a field directly, like
+# object.__setattr__() past the frozen check, but without looking up the
+# attribute by name on every call
+(_set_index, _set_start, _set_end, _set_text, _set_start_us, _set_end_us,
+ _set_char_count, _set_line_count, _set_cps) = (
+    SubtitleEntry.__dict__[name].__set__ for name in (
+        'index', 'start', 'end', 'text', 'start_us', 'end_us',
+        'char_count', 'line_count', 'cps'
+    )
+)
+
+
+def _make_entry(index: int, start: timedelta, end: timedelta, text: str, start_us: int,
+                end_us: int, char_count: int, line_count: int, cps: float) -> SubtitleEntry:
+    """Build a SubtitleEntry from already computed derived values."""
+    entry = object.__new__(SubtitleEntry)
+    _set_index(entry, index)
+    _set_start(entry, start)
+    _set_end(entry, end)
+    _set_text(entry, text)
+    _set_start_us(entry, start_us)
+    _set_end_us(entry, end_us)
+    _set_char_count(entry, char_count)
+    _set_line_count(entry, line_count)
+    _set_cps(entry, cps)
+    return entry
+
+
+@dataclass(slots=True)
+class SubtitleBatch:
+    """A subtitle list stored column-wise, one list per field.
     
-    @property
-    def char_count(self) -> int:
-        """Character count excluding newlines."""
-        return len(self.text.replace('\n', '').replace('\r', ''))
+    Whole-file passes read plain ints and strings from these lists instead
+    of going through one SubtitleEntry (and two timedeltas) per subtitle;
+    entries are only built when asked for.
+    """
+    indexes: list[Optional[int]]
+    starts_us: list[int]
+    ends_us: list[int]
+    texts: list[str]
+    # Character counts excluding newlines, and line counts, per text
+    char_counts: list[int]
+    line_counts: list[int]
     
-    @property
-    def line_count(self) -> int:
-        """Number of lines in the text."""
-        return len(self.text.split('\n'))
+    @classmethod
+    def from_entries(cls, subtitles: list[SubtitleEntry]) -> 'SubtitleBatch':
+        """Build a batch from subtitle entries, reusing their cached values."""
+        return cls(
+            indexes=[sub.index for sub in subtitles],
+            starts_us=[sub.start_us for sub in subtitles],
+            ends_us=[sub.end_us for sub in subtitles],
+            texts=[sub.text for sub in subtitles],
+            char_counts=[sub.char_count for sub in subtitles],
+            line_counts=[sub.line_count for sub in subtitles],
+        )
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def entry(self, i: int) -> SubtitleEntry:
+        """Build the SubtitleEntry at position i."""
+        start_us = self.starts_us[i]
+        end_us = self.ends_us[i]
+        char_count = self.char_counts[i]
+        return _make_entry(self.indexes[i], timedelta(microseconds=start_us),
+                           timedelta(microseconds=end_us), self.texts[i], start_us, end_us,
+                           char_count, self.line_counts[i], _cps(char_count, start_us, end_us))
+    
+    def cps(self) -> list[float]:
+        """CPS of every entry, computed as SubtitleEntry does (inf for zero duration)."""
+        return [
+            char_count / ((end_us - start_us) / 1_000_000) if end_us > start_us else _INF
+            for char_count, start_us, end_us in zip(self.char_counts, self.starts_us, self.ends_us)
+        ]
+    
+    def set_text(self, i: int, text: str) -> None:
+        """Replace the text at position i, updating its cached counts."""
+        self.texts[i] = text
+        self.char_counts[i] = _char_count(text)
+        self.line_counts[i] = text.count('\n') + 1
+    
+    def to_entries(self) -> list[SubtitleEntry]:
+        """Build the SubtitleEntry list for the whole batch."""
+        return [
+            _make_entry(index, timedelta(microseconds=start_us), timedelta(microseconds=end_us),
+                        text, start_us, end_us, char_count, line_count,
+                        _cps(char_count, start_us, end_us))
+            for index, start_us, end_us, text, char_count, line_count in zip(
+                self.indexes, self.starts_us, self.ends_us, self.texts,
+                self.char_counts, self.line_counts
+            )
+        ]
 
 
 class SubtitleStats(NamedTuple):
@@ -45,24 +219,92 @@ class SubtitleStats(NamedTuple):
     total_count: int
 
 
-def _pysrt_time_to_timedelta(time) -> timedelta:
-    """Convert pysrt time to timedelta."""
-    return timedelta(
-        hours=time.hours,
-        minutes=time.minutes,
-        seconds=time.seconds,
-        milliseconds=time.milliseconds
+def _fmt_time(us: int) -> str:
+    """Format integer microseconds as an SRT timestamp (truncated to ms)."""
+    # Integer math: splitting float seconds lost a millisecond on times
+    # like 1.001 s. Negative times are written as zero, like pysrt does.
+    ms = us // 1000 if us > 0 else 0
+    return (
+        f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:"
+        f"{ms // 1000 % 60:02d},{ms % 1000:03d}"
     )
 
 
-def _timedelta_to_pysrt_time(td: timedelta):
-    """Convert timedelta to pysrt SubRipTime."""
-    total_seconds = td.total_seconds()
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = int(total_seconds % 60)
-    milliseconds = int((total_seconds % 1) * 1000)
-    return pysrt.SubRipTime(hours, minutes, seconds, milliseconds)
+def _parse_block(lines: list[str]) -> Optional[tuple[Optional[int], int, int, str]]:
+    """Parse one SRT block (right-stripped, non-blank lines).
+    
+    Args:
+        lines: The block's lines: index, time line, then text lines.
+        
+    Returns:
+        (index, start_us, end_us, text), or None if pysrt would skip the
+        block as invalid.
+    """
+    if len(lines) >= 2 and '-->' not in lines[0]:
+        match = _TIME_LINE_RE.fullmatch(lines[1])
+        if match:
+            try:
+                index = int(lines[0])
+            except ValueError:
+                pass
+            else:
+                h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.groups())
+                return (
+                    index,
+                    (h1 * 3_600_000 + m1 * 60_000 + s1 * 1000 + ms1) * 1000,
+                    (h2 * 3_600_000 + m2 * 60_000 + s2 * 1000 + ms2) * 1000,
+                    '\n'.join(lines[2:]),
+                )
+    
+    # Missing index, odd separators, positions etc.: parse it like pysrt does.
+    # Imported here since well-formed files never get this far.
+    import pysrt
+    try:
+        item = pysrt.SubRipItem.from_lines(lines)
+    except pysrt.Error:
+        return None
+    # ordinal is the time in whole milliseconds
+    return item.index, item.start.ordinal * 1000, item.end.ordinal * 1000, item.text
+
+
+def _iter_srt(content: str) -> Iterator[tuple[Optional[int], int, int, str]]:
+    """Parse decoded SRT content into (index, start_us, end_us, text).
+    
+    Blocks are split on whitespace-only lines and invalid blocks are
+    skipped, matching pysrt's default error handling.
+    
+    Args:
+        content: The file's decoded text.
+        
+    Yields:
+        One tuple per valid block, in file order.
+    """
+    block: list[str] = []
+    for line in content.splitlines():
+        if line.strip():
+            block.append(line.rstrip())
+        elif block:
+            fields = _parse_block(block)
+            if fields is not None:
+                yield fields
+            block = []
+    if block:
+        fields = _parse_block(block)
+        if fields is not None:
+            yield fields
+
+
+def _read_srt(path: str) -> str:
+    """Read and decode an SRT file."""
+    # Read once and decode in memory. Decoding the bytes directly keeps line
+    # endings for splitlines(), as pysrt does. utf-8-sig also reads plain
+    # UTF-8, and latin-1 maps every byte, so it is the last fallback.
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        return raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
 
 
 def load_srt(path: str) -> list[SubtitleEntry]:
@@ -74,52 +316,72 @@ def load_srt(path: str) -> list[SubtitleEntry]:
     Returns:
         List of SubtitleEntry objects.
     """
-    # Try multiple encodings
-    encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'cp1252']
-    subs = None
-    
-    for encoding in encodings:
-        try:
-            subs = pysrt.open(path, encoding=encoding)
-            break
-        except (UnicodeDecodeError, UnicodeError):
-            continue
-    
-    if subs is None:
-        raise ValueError(f"Could not decode SRT file: {path}")
-    
     entries = []
-    for sub in subs:
-        entry = SubtitleEntry(
-            index=sub.index,
-            start=_pysrt_time_to_timedelta(sub.start),
-            end=_pysrt_time_to_timedelta(sub.end),
-            text=sub.text
-        )
-        entries.append(entry)
-    
+    append = entries.append
+    for index, start_us, end_us, text in _iter_srt(_read_srt(path)):
+        # Times are parsed to microseconds, so the entry's derived values
+        # are filled in directly instead of being read back from timedeltas.
+        # Parsed texts are joined with '\n' only (no '\r'), so one count
+        # gives both the line count and the characters excluding newlines.
+        newlines = text.count('\n')
+        char_count = len(text) - newlines
+        append(_make_entry(index, timedelta(microseconds=start_us),
+                           timedelta(microseconds=end_us), text, start_us, end_us,
+                           char_count, newlines + 1,
+                           _cps(char_count, start_us, end_us)))
     return entries
 
 
+def load_srt_batch(path: str) -> SubtitleBatch:
+    """Load SRT file straight into a SubtitleBatch.
+    
+    Same entries as load_srt(), stored column-wise without building a
+    SubtitleEntry for each.
+    
+    Args:
+        path: Path to the SRT file.
+        
+    Returns:
+        SubtitleBatch of the file's subtitles.
+    """
+    rows = list(_iter_srt(_read_srt(path)))
+    if not rows:
+        return SubtitleBatch([], [], [], [], [], [])
+    # Rows to columns in one C-level pass
+    indexes, starts_us, ends_us, texts = map(list, zip(*rows))
+    # As in load_srt(): texts hold no '\r', so the newline counts give both
+    newlines = [text.count('\n') for text in texts]
+    return SubtitleBatch(
+        indexes=indexes,
+        starts_us=starts_us,
+        ends_us=ends_us,
+        texts=texts,
+        char_counts=list(map(int.__sub__, map(len, texts), newlines)),
+        line_counts=[count + 1 for count in newlines],
+    )
+
+
 def save_srt(subtitles: list[SubtitleEntry], path: str) -> None:
     """Save subtitle entries to SRT file.
     
+    Entries are numbered from 1 in list order; their index is ignored.
+    
     Args:
         subtitles: List of SubtitleEntry objects.
         path: Output file path.
     """
-    srt_file = pysrt.SubRipFile()
-    
+    parts = []
     for i, sub in enumerate(subtitles, 1):
-        item = pysrt.SubRipItem(
-            index=i,
-            start=_timedelta_to_pysrt_time(sub.start),
-            end=_timedelta_to_pysrt_time(sub.end),
-            text=sub.text
-        )
-        srt_file.append(item)
+        text = sub.text
+        parts.append(f"{i}\n{_fmt_time(sub.start_us)} --> {_fmt_time(sub.end_us)}\n{text}\n")
+        # Blank separator line, unless the text already ends with one
+        if text and not text.endswith('\n'):
+            parts.append('\n')
     
-    srt_file.save(path, encoding='utf-8')
+    # Same output as pysrt's SubRipFile.save(): one write, with newlines
+    # translated to the platform line ending
+    with open(path, 'w', encoding='utf-8', newline=os.linesep) as f:
+        f.write(''.join(parts))
 
 
 def calculate_cps(subtitle: SubtitleEntry) -> float:
@@ -131,49 +393,64 @@ def calculate_cps(subtitle: SubtitleEntry) -> float:
     Returns:
         CPS value. Returns infinity for zero duration.
     """
-    duration = subtitle.duration
-    if duration <= 0:
-        return float('inf')
-    
-    char_count = subtitle.char_count
-    return char_count / duration
+    # Computed once when the entry is created
+    return subtitle.cps
 
 
 def get_subtitle_stats(
-    subtitles: list[SubtitleEntry],
+    subtitles: Union[list[SubtitleEntry], SubtitleBatch],
     target_cps: float = 21.0
 ) -> dict:
     """Get CPS statistics for subtitle list.
     
     Args:
-        subtitles: List of subtitle entries.
+        subtitles: List of subtitle entries, or a SubtitleBatch.
         target_cps: Target CPS threshold.
         
     Returns:
-        Dictionary with min_cps, max_cps, avg_cps, high_cps_count, total_count.
+        Dictionary with min_cps, max_cps, avg_cps, p95_cps (the CPS that 95%
+        of entries stay under), high_cps_count, total_count.
     """
     if not subtitles:
         return {
             'min_cps': 0,
             'max_cps': 0,
             'avg_cps': 0,
+            'p95_cps': 0,
             'high_cps_count': 0,
             'total_count': 0,
         }
     
-    cps_values = [calculate_cps(sub) for sub in subtitles]
-    # Filter out infinity for stats
-    finite_cps = [c for c in cps_values if c != float('inf')]
+    # Filter out infinity for stats (zero-duration entries are rare, so the
+    # list is only rebuilt when one is present)
+    if isinstance(subtitles, SubtitleBatch):
+        finite_cps = subtitles.cps()
+    else:
+        finite_cps = [sub.cps for sub in subtitles]
+    if _INF in finite_cps:
+        finite_cps = [c for c in finite_cps if c != _INF]
     
     if not finite_cps:
-        finite_cps = [0]
-    
-    high_count = sum(1 for c in cps_values if c > target_cps and c != float('inf'))
+        return {
+            'min_cps': 0,
+            'max_cps': 0,
+            'avg_cps': 0.0,
+            'p95_cps': 0,
+            'high_cps_count': 0,
+            'total_count': len(subtitles),
+        }
     
+    # Summed before sorting so the average is added up in subtitle order.
+    # Once sorted, min/max/p95 are read by position and the count above
+    # target is one bisection instead of a comparison per entry in Python.
+    total = sum(finite_cps)
+    finite_cps.sort()
+    count = len(finite_cps)
     return {
-        'min_cps': min(finite_cps),
-        'max_cps': max(finite_cps),
-        'avg_cps': sum(finite_cps) / len(finite_cps),
-        'high_cps_count': high_count,
+        'min_cps': finite_cps[0],
+        'max_cps': finite_cps[-1],
+        'avg_cps': total / count,
+        'p95_cps': finite_cps[count * 95 // 100],
+        'high_cps_count': count - bisect_right(finite_cps, target_cps),
         'total_count': len(subtitles),
     }
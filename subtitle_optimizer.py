@@ -13,22 +13,33 @@ import os
 import sys
 from datetime import timedelta
 from pathlib import Path
+from typing import Optional
 
 
-def load_env_file():
-    """Load environment variables from .env file if it exists."""
-    env_path = Path(__file__).parent / '.env'
-    if env_path.exists():
+def load_env_file(env_path: Optional[Path] = None) -> None:
+    """Load environment variables from .env file if it exists.
+    
+    Variables already set in the environment are kept.
+    
+    Args:
+        env_path: File to read (default: .env next to this script).
+    """
+    if env_path is None:
+        env_path = Path(__file__).parent / '.env'
+    try:
         with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ.setdefault(key.strip(), value.strip())
-
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        key, sep, value = line.partition('=')
+        if sep:
+            os.environ.setdefault(key.strip(), value.strip())
 
-# Load .env file before anything else
-load_env_file()
 
 from src.srt_processor import (
     load_srt,
@@ -49,10 +60,7 @@ from src.llm_shortener import (
     export_segments_json,
     load_segments_json,
 )
-from src.interjection_remover import (
-    RemoveInterjection,
-    InterjectionRemoveContext,
-)
+from src.interjection_remover import RemoveInterjection
 from src.interjections_en import INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN
 
 
@@ -80,6 +88,7 @@ Examples:
     parser.add_argument('--api-key', default=os.environ.get('GEMINI_API_KEY'), 
                         help='Gemini API key (defaults to GEMINI_API_KEY env var or .env)')
     parser.add_argument('--model', default='gemini-2.5-flash', help='Gemini model (default: gemini-2.5-flash)')
+    parser.add_argument('--llm-cache', help='SQLite file caching LLM results across runs')
     parser.add_argument('--simplify', action='store_true', help='Simplify for translation')
     parser.add_argument('--skip-interjections', action='store_true', help='Skip interjection removal')
     parser.add_argument('--skip-cps-opt', action='store_true', help='Skip CPS optimization')
@@ -103,30 +112,19 @@ def phase1_remove_interjections(subtitles: list[SubtitleEntry], verbose: bool =
     if verbose:
         print("\n🔄 Phase 1: Removing interjections...")
     
-    remover = RemoveInterjection()
+    remove = RemoveInterjection(INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN).remove
     result = []
+    append = result.append
     removed_count = 0
     
     for sub in subtitles:
-        context = InterjectionRemoveContext(
-            text=sub.text,
-            interjections=INTERJECTIONS_EN,
-            interjections_skip_if_starts_with=INTERJECTIONS_SKIP_EN,
-            only_separated_lines=False,
-        )
-        
-        new_text = remover.invoke(context)
+        new_text = remove(sub.text)
         
         if new_text != sub.text:
             removed_count += 1
         
-        if new_text.strip():
-            result.append(SubtitleEntry(
-                index=sub.index,
-                start=sub.start,
-                end=sub.end,
-                text=new_text
-            ))
+        if new_text and not new_text.isspace():
+            append(sub if new_text == sub.text else sub.with_text(new_text))
         # Skip empty subtitles after interjection removal
     
     if verbose:
@@ -146,12 +144,7 @@ def phase1_5_reduce_lines(subtitles: list[SubtitleEntry], max_lines: int = 2, ve
     for sub in subtitles:
         if sub.line_count > max_lines:
             new_text = reduce_lines(sub.text, max_lines)
-            result.append(SubtitleEntry(
-                index=sub.index,
-                start=sub.start,
-                end=sub.end,
-                text=new_text
-            ))
+            result.append(sub.with_text(new_text))
             reduced_count += 1
         else:
             result.append(sub)
@@ -162,6 +155,52 @@ def phase1_5_reduce_lines(subtitles: list[SubtitleEntry], max_lines: int = 2, ve
     return result
 
 
+def phase1_clean_text(
+    subtitles: list[SubtitleEntry],
+    max_lines: int = 2,
+    remove_interjections: bool = True,
+    verbose: bool = False
+) -> list[SubtitleEntry]:
+    """Phases 1 and 1.5 in a single pass over the subtitles.
+    
+    Gives the same result as phase1_remove_interjections() followed by
+    phase1_5_reduce_lines(), without building the intermediate list.
+    """
+    if verbose:
+        action = "Removing interjections and reducing" if remove_interjections else "Reducing"
+        print(f"\n🔄 Phase 1: {action} lines to max {max_lines}...")
+    
+    remove = RemoveInterjection(INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN).remove
+    result = []
+    append = result.append
+    removed_count = 0
+    reduced_count = 0
+    
+    for sub in subtitles:
+        text = sub.text
+        
+        if remove_interjections:
+            text = remove(text)
+            if text != sub.text:
+                removed_count += 1
+            if not text or text.isspace():
+                # Skip empty subtitles after interjection removal
+                continue
+        
+        if text.count('\n') + 1 > max_lines:
+            text = reduce_lines(text, max_lines)
+            reduced_count += 1
+        
+        append(sub if text == sub.text else sub.with_text(text))
+    
+    if verbose:
+        if remove_interjections:
+            print(f"  Modified {removed_count} entries, removed {len(subtitles) - len(result)} empty entries")
+        print(f"  Reduced {reduced_count} entries")
+    
+    return result
+
+
 def phase2_optimize_cps(
     subtitles: list[SubtitleEntry],
     target_cps: float,
@@ -204,14 +243,22 @@ def phase4_llm_shortening(
     segments,
     api_key: str,
     model: str,
-    verbose: bool = False
+    verbose: bool = False,
+    cache_path: Optional[str] = None
 ) -> list[SubtitleEntry]:
     """Phase 4: Use LLM to shorten high-CPS segments."""
     if verbose:
         print(f"\n🔄 Phase 4: LLM shortening with {model}...")
     
     try:
-        shortened_segments = shorten_with_llm(segments, api_key, model)
+        if cache_path:
+            # sqlite3 is only imported when a cache is actually used
+            from src.llm_cache import LLMCache
+            
+            with LLMCache(cache_path) as cache:
+                shortened_segments = shorten_with_llm(segments, api_key, model, cache=cache)
+        else:
+            shortened_segments = shorten_with_llm(segments, api_key, model)
         result = apply_shortened_text(subtitles, shortened_segments)
         
         applied = sum(1 for s in shortened_segments if s.shortened_text)
@@ -225,21 +272,10 @@ def phase4_llm_shortening(
         return subtitles
 
 
-def reindex_subtitles(subtitles: list[SubtitleEntry]) -> list[SubtitleEntry]:
-    """Re-index subtitles sequentially starting from 1."""
-    return [
-        SubtitleEntry(
-            index=i,
-            start=sub.start,
-            end=sub.end,
-            text=sub.text
-        )
-        for i, sub in enumerate(subtitles, 1)
-    ]
-
-
 def main():
     """Main entry point."""
+    # Before parse_args(): .env may provide the --api-key default
+    load_env_file()
     args = parse_args()
     
     # Check input file
@@ -268,12 +304,10 @@ def main():
             max_duration=args.max_duration,
         )
         
-        # Phase 1: Remove interjections
-        if not args.skip_interjections:
-            subtitles = phase1_remove_interjections(subtitles, args.verbose)
-        
-        # Phase 1.5: Reduce lines
-        subtitles = phase1_5_reduce_lines(subtitles, args.max_lines, args.verbose)
+        # Phases 1 and 1.5: Remove interjections and reduce lines
+        subtitles = phase1_clean_text(
+            subtitles, args.max_lines, not args.skip_interjections, args.verbose
+        )
         
         # Phase 2: Optimize CPS
         if not args.skip_cps_opt:
@@ -290,11 +324,11 @@ def main():
         # Phase 4: LLM shortening if API key provided
         if args.api_key and segments:
             subtitles = phase4_llm_shortening(
-                subtitles, segments, args.api_key, args.model, args.verbose
+                subtitles, segments, args.api_key, args.model, args.verbose, args.llm_cache
             )
     
-    # Re-index subtitles
-    subtitles = reindex_subtitles(subtitles)
+    # No re-indexing pass needed: save_srt() numbers entries from 1 as it
+    # writes them, and nothing below reads the index
     
     # Final statistics
     if args.verbose:
@@ -1,16 +1,69 @@
-"""Pytest fixtures for interjection remover tests."""
+"""Shared pytest fixtures."""
+
+import json
+import re
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 from src.interjection_remover import InterjectionRemoveContext, RemoveInterjection
 from src.interjections_en import INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN
+from src.srt_processor import SubtitleEntry, load_srt
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def remover() -> RemoveInterjection:
-    """Return a RemoveInterjection instance."""
+    """Return a RemoveInterjection instance shared by all tests.
+    
+    Sharing is safe because results depend only on the call's text, word
+    lists and only_separated_lines. The instance remembers the last
+    context's word lists but compares them by value on every call, and
+    cached results are keyed on the resolved lists rather than the instance.
+    """
     return RemoveInterjection()
 
 
+@pytest.fixture(scope="session")
+def sample_subs() -> list[SubtitleEntry]:
+    """Return tests/fixtures/sample.srt, parsed once per session.
+    
+    Entries are immutable; tests must not modify the list itself. Tests
+    using it are skipped when the sample file is not present.
+    """
+    path = Path(__file__).parent / 'fixtures' / 'sample.srt'
+    if not path.exists():
+        pytest.skip(f"sample subtitle file not found: {path}")
+    return load_srt(str(path))
+
+
+@pytest.fixture
+def fake_genai():
+    """Return a factory for fake google.genai modules.
+    
+    The factory takes a list and returns a sys.modules patch whose client
+    echoes each prompt's indexes back as "short <index>", appending the
+    indexes of every prompt it receives to that list.
+    """
+    lock = threading.Lock()
+    
+    def make(calls: list) -> dict:
+        def generate_content(model, contents):
+            indexes = [int(i) for i in re.findall(r'^Index: (\d+)$', contents, re.M)]
+            with lock:
+                calls.append(indexes)
+            return MagicMock(text=json.dumps([{"index": i, "text": f"short {i}"} for i in indexes]))
+        
+        client = MagicMock()
+        client.models.generate_content.side_effect = generate_content
+        genai = MagicMock()
+        genai.Client.return_value = client
+        google = MagicMock(genai=genai)
+        return {'google': google, 'google.genai': genai}
+    
+    return make
+
+
 @pytest.fixture
 def interjections() -> list[str]:
     """Return the default English interjections list."""
@@ -2,13 +2,16 @@
 
 import pytest
 from datetime import timedelta
-from src.srt_processor import SubtitleEntry
+from src.srt_processor import SubtitleBatch, SubtitleEntry, save_srt
 from src.cps_optimizer import (
     extend_timing,
     can_merge,
     merge_subtitles,
     reduce_lines,
     optimize_cps,
+    optimize_batch,
+    iter_optimize_cps,
+    optimize_many,
     OptimizationConstraints,
 )
 
@@ -75,6 +78,21 @@ class TestCanMerge:
         constraints = OptimizationConstraints(max_chars=90, max_lines=2, max_duration=7.0)
         assert can_merge(sub1, sub2, constraints) == False
 
+    def test_cannot_merge_too_long_duration(self):
+        """Cannot merge when combined duration exceeds max."""
+        sub1 = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=4), "Hello")
+        sub2 = SubtitleEntry(2, timedelta(seconds=4), timedelta(seconds=8), "world")
+        
+        constraints = OptimizationConstraints(max_chars=90, max_lines=2, max_duration=7.0)
+        assert can_merge(sub1, sub2, constraints) == False
+
+    def test_constraints_are_frozen(self):
+        """Constraints cannot be modified after creation."""
+        constraints = OptimizationConstraints()
+        
+        with pytest.raises(AttributeError):
+            constraints.max_chars = 10
+
 
 class TestMergeSubtitles:
     """Tests for subtitle merging."""
@@ -126,6 +144,43 @@ class TestReduceLines:
         
         assert reduced.count('\n') <= 1
 
+    def test_reduce_joins_shortest_pairs(self):
+        """The shortest adjacent pair is joined first, leftmost on ties."""
+        text = "Hello there\nA\nB\nGeneral Kenobi"
+        
+        assert reduce_lines(text, max_lines=3) == "Hello there\nA B\nGeneral Kenobi"
+        assert reduce_lines(text, max_lines=2) == "Hello there A B\nGeneral Kenobi"
+
+    def test_reduce_three_lines_joins_shorter_side(self):
+        """With three lines, the middle one joins the shorter outer line."""
+        assert reduce_lines("Hi\nthere\nGeneral Kenobi", max_lines=2) == "Hi there\nGeneral Kenobi"
+        assert reduce_lines("General Kenobi\nhi\nthere", max_lines=2) == "General Kenobi\nhi there"
+        assert reduce_lines("ab\nx\ncd", max_lines=2) == "ab x\ncd"
+
+    def test_short_and_long_texts_merge_alike(self):
+        """Texts on either side of the small-input path join pairs the same way."""
+        short = "aa\nb\nc\ndd\ne\nf"
+        long = short + "\ngg\nh"
+        
+        assert reduce_lines(short, max_lines=2) == "aa b c\ndd e f"
+        assert reduce_lines(long, max_lines=3) == "aa b c\ndd e f\ngg h"
+
+    def test_reduce_to_single_line(self):
+        """max_lines=1 joins everything with spaces."""
+        assert reduce_lines("A\nB\nC", max_lines=1) == "A B C"
+
+    def test_repeated_long_text_is_cached(self):
+        """A repeated multi-line text is reduced once; short texts skip the cache."""
+        from src.cps_optimizer import _reduce_long_text
+        _reduce_long_text.cache_clear()
+        text = "La la\nla la la\nla"
+        
+        assert reduce_lines(text, 2) == reduce_lines(text, 2) == "La la\nla la la la"
+        assert reduce_lines("Just one\nor two", 2) == "Just one\nor two"
+        
+        info = _reduce_long_text.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
 
 class TestOptimizeCPS:
     """Tests for main optimization loop."""
@@ -142,3 +197,126 @@ class TestOptimizeCPS:
         
         # First subtitle should have extended timing
         assert optimized[0].end > subs[0].end or optimized[0].duration > subs[0].duration
+
+    def test_optimize_merges_low_cps_pair(self):
+        """Adjacent low-CPS subtitles are merged pairwise."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "Hi"),
+            SubtitleEntry(2, timedelta(seconds=1), timedelta(seconds=2), "there"),
+            SubtitleEntry(3, timedelta(seconds=2), timedelta(seconds=3), "you"),
+        ]
+        
+        constraints = OptimizationConstraints(max_chars=90, max_lines=3, max_duration=7.0)
+        optimized = optimize_cps(subs, target_cps=21, constraints=constraints)
+        
+        # A merged entry is not merged again with the following one
+        assert [s.text for s in optimized] == ["Hi\nthere", "you"]
+        assert optimized[0].index == 1
+        assert optimized[0].end == timedelta(seconds=2)
+
+    def test_optimize_zero_length_span(self):
+        """A pair spanning zero time is not merged (and doesn't raise)."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=1), timedelta(seconds=1), "A"),
+            SubtitleEntry(2, timedelta(seconds=1), timedelta(seconds=1), "B"),
+            SubtitleEntry(3, timedelta(seconds=1), timedelta(seconds=2), "C"),
+        ]
+        
+        optimized = optimize_cps(subs, target_cps=21)
+        
+        assert optimized[0].text == "A"
+
+    def test_optimize_nothing_to_do(self):
+        """Well-paced entries that can't merge come back unchanged."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "Line one\nLine two"),
+            SubtitleEntry(2, timedelta(seconds=3), timedelta(seconds=5), "Line three\nLine four"),
+        ]
+        
+        optimized = optimize_cps(subs, target_cps=21)
+        
+        assert optimized == subs
+        assert optimized is not subs
+
+
+class TestIterOptimizeCPS:
+    """Tests for iter_optimize_cps function."""
+    
+    def test_matches_optimize_cps(self):
+        """Streaming output equals the list-based optimizer."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "This is high CPS text"),
+            SubtitleEntry(2, timedelta(seconds=5), timedelta(seconds=6), "Hi"),
+            SubtitleEntry(3, timedelta(seconds=6), timedelta(seconds=7), "there"),
+            SubtitleEntry(4, timedelta(seconds=7), timedelta(seconds=8), "you"),
+            SubtitleEntry(5, timedelta(seconds=8, milliseconds=50), timedelta(seconds=8, milliseconds=500), "Far too much text here"),
+        ]
+        
+        constraints = OptimizationConstraints(max_chars=90, max_lines=3, max_duration=7.0)
+        expected = optimize_cps(subs, target_cps=21, constraints=constraints)
+        streamed = list(iter_optimize_cps(iter(subs), target_cps=21, constraints=constraints))
+        
+        assert streamed == expected
+    
+    def test_empty_input(self):
+        """Empty input yields nothing."""
+        assert list(iter_optimize_cps([])) == []
+
+
+class TestOptimizeBatch:
+    """Tests for optimize_batch function."""
+    
+    def test_matches_optimize_cps(self):
+        """Column-wise output equals the list-based optimizer."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "This is high CPS text"),
+            SubtitleEntry(2, timedelta(seconds=5), timedelta(seconds=6), "Hi"),
+            SubtitleEntry(3, timedelta(seconds=6), timedelta(seconds=7), "there\nyou"),
+            SubtitleEntry(4, timedelta(seconds=7), timedelta(seconds=8), "you"),
+            SubtitleEntry(5, timedelta(seconds=8, milliseconds=50), timedelta(seconds=8, milliseconds=500), "Far too much text here"),
+        ]
+        batch = SubtitleBatch.from_entries(subs)
+        
+        constraints = OptimizationConstraints(max_chars=90, max_lines=3, max_duration=7.0)
+        expected = optimize_cps(subs, target_cps=21, constraints=constraints)
+        optimized = optimize_batch(batch, target_cps=21, constraints=constraints)
+        
+        assert optimized.to_entries() == expected
+        assert optimized.line_counts == [e.line_count for e in expected]
+        assert optimized.char_counts == [e.char_count for e in expected]
+        # The input batch is untouched
+        assert batch.to_entries() == subs
+    
+    def test_empty_batch(self):
+        """An empty batch gives an empty batch."""
+        assert len(optimize_batch(SubtitleBatch.from_entries([]))) == 0
+
+
+class TestOptimizeMany:
+    """Tests for optimize_many function."""
+    
+    def test_matches_optimize_cps_per_file(self, tmp_path):
+        """Each file is optimized as optimize_cps would, in input order."""
+        files = {
+            "a.srt": [
+                SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "This is high CPS text"),
+                SubtitleEntry(2, timedelta(seconds=5), timedelta(seconds=6), "More text"),
+            ],
+            "b.srt": [
+                SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "Hi"),
+                SubtitleEntry(2, timedelta(seconds=1), timedelta(seconds=2), "there"),
+            ],
+        }
+        paths = []
+        for name, subs in files.items():
+            path = tmp_path / name
+            save_srt(subs, str(path))
+            paths.append(str(path))
+        
+        results = optimize_many(paths, target_cps=21, max_workers=2)
+        
+        assert results == [optimize_cps(subs, target_cps=21) for subs in files.values()]
+    
+    def test_empty_paths(self):
+        """No paths gives no results."""
+        assert optimize_many([]) == []
@@ -5,7 +5,17 @@ Test cases based on RemoveTextForHearImpairedTest.cs from SubtitleEdit.
 
 import os
 import pytest
-from src.interjection_remover import InterjectionRemoveContext, RemoveInterjection
+from src.interjection_remover import (
+    InterjectionRemoveContext,
+    RemoveInterjection,
+    capitalize_first_letter,
+    get_number_of_lines,
+    has_sentence_ending,
+    remove_html_tags,
+    split_to_lines,
+    _interjection_index,
+)
+from src.interjections_en import INTERJECTIONS_EN
 from tests.conftest import make_context
 
 
@@ -276,6 +286,13 @@ class TestEdgeCases:
         actual = remover.invoke(make_context(text))
         assert actual == text
 
+    def test_no_interjections_punctuation_line(self, remover: RemoveInterjection):
+        """A punctuation-only second line is dropped even without interjections."""
+        text = "Hello there.\n..."
+        expected = "Hello there."
+        actual = remover.invoke(make_context(text))
+        assert actual == expected
+
     def test_only_interjection(self, remover: RemoveInterjection):
         """Single interjection only returns empty."""
         text = "Hmm."
@@ -297,6 +314,34 @@ class TestEdgeCases:
         actual = remover.invoke(make_context(text))
         assert actual == text
 
+    def test_non_ascii_text(self, remover: RemoveInterjection):
+        """Interjections are found in text with non-ASCII characters."""
+        text = "Hmm, café time."
+        expected = "Café time."
+        actual = remover.invoke(make_context(text))
+        assert actual == expected
+
+    def test_hyphenated_run(self, remover: RemoveInterjection):
+        """Hyphenated interjections are found inside longer hyphenated runs."""
+        text = "Well, mm-hmm-mm, sure."
+        expected = "Well, sure."
+        actual = remover.invoke(make_context(text))
+        assert actual == expected
+
+    def test_word_boundaries(self, remover: RemoveInterjection):
+        """Digits and underscores count as word characters."""
+        text = "Uh_oh, fine. Uh, ok."
+        expected = "Uh_oh, fine. Ok."
+        actual = remover.invoke(make_context(text))
+        assert actual == expected
+
+    def test_custom_interjection_with_space(self, remover: RemoveInterjection):
+        """Custom interjections need not be single words."""
+        text = "Oh well, let's go."
+        expected = "Let's go."
+        actual = remover.invoke(make_context(text, interjections=["Oh well"]))
+        assert actual == expected
+
 
 class TestCapitalization:
     """Capitalization after removal tests."""
@@ -332,3 +377,160 @@ class TestOnlySeparatedLines:
         # In only_separated_lines mode, inline interjections should be preserved
         actual = remover.invoke(make_context(text, only_separated_lines=True))
         assert actual == text
+
+
+class TestResultCache:
+    """Repeated cues are served from the result cache."""
+
+    def test_cache_keyed_by_word_lists(self, remover: RemoveInterjection):
+        """The same text with different lists is not answered from the cache."""
+        text = "Hmm, I think so."
+        assert remover.invoke(make_context(text)) == "I think so."
+        assert remover.invoke(make_context(text, interjections=["Uh"])) == text
+        assert remover.invoke(make_context(text, skip_list=["Hmm, I"])) == text
+
+    def test_mutated_list_is_seen(self, remover: RemoveInterjection):
+        """Changing the word list after a call affects later results."""
+        words = ["Uh"]
+        text = "Wow, nice."
+        assert remover.invoke(make_context(text, interjections=words)) == text
+        words.append("Wow")
+        assert remover.invoke(make_context(text, interjections=words)) == "Nice."
+
+    def test_mutated_skip_list_is_seen(self, remover: RemoveInterjection):
+        """Changing the skip list between calls with the same list object takes effect."""
+        skip = []
+        text = "Hmm, I think so."
+        assert remover.invoke(make_context(text, skip_list=skip)) == "I think so."
+        skip.append("Hmm, I")
+        assert remover.invoke(make_context(text, skip_list=skip)) == text
+
+    def test_cache_does_not_keep_instances_alive(self):
+        """A discarded remover is freed even though its results stay cached."""
+        import gc
+        import weakref
+        remover = RemoveInterjection()
+        remover.invoke(make_context("Hmm, fine."))
+        ref = weakref.ref(remover)
+        del remover
+        gc.collect()
+        assert ref() is None
+
+    def test_no_regex_compiled_per_call(self, monkeypatch):
+        """Once the patterns for a word list exist, new texts compile nothing."""
+        import re
+        # Own instance, so no earlier test's results are cached for these texts
+        remover = RemoveInterjection()
+        remover.invoke(make_context("Hmm, ça va. Oh, well."))
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("re.compile called during invoke")
+        monkeypatch.setattr(re, "compile", fail)
+        
+        assert remover.invoke(make_context("Oh, ça marche. Hmm.")) == "Ça marche."
+        assert remover.invoke(make_context("Hmm, fine.")) == "Fine."
+
+
+class TestInterjectionIndex:
+    """Tests for the one-scan interjection finder."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("I don't know what you mean.", None),
+        ("Uhm, the hum is huge.", None),
+        ("Say it: uh-huh-yes.", {"uh-huh"}),
+        ("MM-HM, sure.", {"mm-hm"}),
+        ("- Oh!\n- Wow.", {"oh", "wow"}),
+        ("Hmm_ok hmm2", None),
+    ])
+    def test_ascii_candidates(self, text, expected):
+        """Texts without a whole-word interjection are rejected; others list the words found."""
+        index = _interjection_index(tuple(INTERJECTIONS_EN))
+        found = index.candidates(text)
+        if expected is None:
+            assert found is None
+        else:
+            assert expected <= found
+
+
+class TestRemoveText:
+    """Tests for RemoveInterjection.remove() with lists bound at construction."""
+
+    @pytest.mark.parametrize("text", [
+        "Hmm, I think so.",
+        "- Uh-huh.\n- Okay, I'll do it.",
+        "Oh, my God.",
+        "Well... Ah!",
+        "",
+        "   ",
+    ])
+    def test_matches_invoke(self, remover: RemoveInterjection, text: str):
+        """remove() gives the same result as invoke() with the default lists."""
+        assert remover.remove(text) == remover.invoke(make_context(text))
+
+    def test_only_separated_lines(self, remover: RemoveInterjection):
+        """The only_separated_lines flag is passed through."""
+        text = "Hmm, I think so.\n- Uh."
+        assert remover.remove(text, only_separated_lines=True) == \
+            remover.invoke(make_context(text, only_separated_lines=True))
+
+    def test_custom_lists_are_snapshots(self):
+        """Lists passed to the constructor are copied, not referenced."""
+        words = ["Wow"]
+        remover = RemoveInterjection(words, [])
+        words.append("Uh")
+        assert remover.remove("Wow, nice.") == "Nice."
+        assert remover.remove("Uh, nice.") == "Uh, nice."
+
+
+class TestRemoveHtmlTags:
+    """Tests for the remove_html_tags helper."""
+
+    def test_removes_tags(self):
+        """Tags are removed, text between them is kept."""
+        assert remove_html_tags("<i>Hello</i> <b>there</b>") == "Hello there"
+
+    def test_text_without_tags(self):
+        """Text without tags is returned as is."""
+        assert remove_html_tags("a > b") == "a > b"
+
+
+class TestLineHelpers:
+    """Tests for the line splitting helpers."""
+
+    def test_split_mixed_newlines(self):
+        """Both \\r\\n and \\n separate lines; a lone \\r does not."""
+        assert split_to_lines("a\r\nb\nc\rd") == ["a", "b", "c\rd"]
+
+    def test_number_of_lines(self):
+        """Line count matches split_to_lines, including a trailing newline."""
+        for text in ("", "a", "a\nb", "a\r\nb\r\n", "a\rb"):
+            assert get_number_of_lines(text) == len(split_to_lines(text))
+
+
+class TestCapitalizeFirstLetter:
+    """Tests for capitalize_first_letter."""
+
+    def test_skips_leading_punctuation(self):
+        """The first letter after punctuation and digits is capitalized."""
+        assert capitalize_first_letter("¿qué?") == "¿Qué?"
+        assert capitalize_first_letter("... 2 fast") == "... 2 Fast"
+
+    def test_numeric_characters_are_not_letters(self):
+        """Superscripts and roman numerals are skipped like isalpha() does."""
+        assert capitalize_first_letter("² Ⅻ ok") == "² Ⅻ Ok"
+
+    def test_no_letters(self):
+        """Text without letters is returned unchanged."""
+        assert capitalize_first_letter("-- 42 _") == "-- 42 _"
+        assert capitalize_first_letter("") == ""
+
+
+class TestHasSentenceEnding:
+    """Tests for has_sentence_ending."""
+
+    def test_trailing_whitespace_ignored(self):
+        """Punctuation followed by any whitespace still ends a sentence."""
+        assert has_sentence_ending("Done.")
+        assert has_sentence_ending("Really?\u3000\n")
+        assert not has_sentence_ending("Done,  ")
+        assert not has_sentence_ending(" \t")
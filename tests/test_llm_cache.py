@@ -0,0 +1,82 @@
+"""Tests for the LLM result cache."""
+
+from unittest.mock import patch
+
+from src.llm_cache import LLMCache
+from src.llm_shortener import HighCPSSegment, shorten_with_llm
+
+
+def _segment(index: int, text: str, chars_to_reduce: int = 6) -> HighCPSSegment:
+    return HighCPSSegment(index=index, original_text=text, current_cps=25,
+                          target_cps=21, chars_to_reduce=chars_to_reduce)
+
+
+class TestLLMCache:
+    """Tests for LLMCache."""
+
+    def test_store_and_fill(self, tmp_path):
+        """Stored results are found again after reopening the file."""
+        path = str(tmp_path / "cache.sqlite")
+        seg = _segment(1, "This is far too long")
+        seg.shortened_text = "Too long"
+        with LLMCache(path) as cache:
+            cache.store("m", [seg, _segment(2, "No result yet")])
+        
+        fresh = [_segment(5, "This is far too long"), _segment(6, "No result yet")]
+        with LLMCache(path) as cache:
+            misses = cache.fill("m", fresh)
+        
+        assert fresh[0].shortened_text == "Too long"
+        assert misses == [fresh[1]]
+
+    def test_key_includes_model_and_reduction(self):
+        """The same text for another model or reduction is a miss."""
+        with LLMCache(":memory:") as cache:
+            seg = _segment(1, "Text")
+            seg.shortened_text = "T"
+            cache.store("m", [seg])
+            
+            assert len(cache.fill("other", [_segment(1, "Text")])) == 1
+            assert len(cache.fill("m", [_segment(1, "Text", chars_to_reduce=9)])) == 1
+
+
+    def test_key_includes_next_is_uppercase(self):
+        """Segments differing only in next_is_uppercase don't share an entry."""
+        upper = _segment(1, "Text")
+        lower = _segment(1, "Text")
+        lower.next_is_uppercase = False
+        
+        assert LLMCache.key("m", upper) != LLMCache.key("m", lower)
+        with LLMCache(":memory:") as cache:
+            upper.shortened_text = "Text."
+            cache.store("m", [upper])
+            assert cache.fill("m", [lower]) == [lower]
+
+    def test_key_uses_prompt_context(self):
+        """Context counts only as far as the prompt includes it."""
+        base = _segment(1, "Text")
+        other = _segment(1, "Text")
+        other.context_after = "Next line"
+        longer = _segment(1, "Text")
+        base.context_after = "x" * 50 + " one ending"
+        longer.context_after = "x" * 50 + " another ending"
+        
+        assert LLMCache.key("m", base) != LLMCache.key("m", other)
+        assert LLMCache.key("m", base) == LLMCache.key("m", longer)
+
+    def test_key_is_unambiguous(self):
+        """Separator characters inside the fields can't make keys collide."""
+        assert LLMCache.key("a:b", _segment(1, "c")) != LLMCache.key("a", _segment(1, "b:c"))
+
+class TestShortenWithCache:
+    """shorten_with_llm() only asks the model about cache misses."""
+
+    def test_only_misses_are_sent(self, fake_genai):
+        """Cached segments are filled in without an API call."""
+        calls = []
+        with LLMCache(":memory:") as cache, patch.dict('sys.modules', fake_genai(calls)):
+            shorten_with_llm([_segment(1, "A"), _segment(2, "B")], "key", cache=cache)
+            result = shorten_with_llm([_segment(3, "B"), _segment(4, "C")], "key", cache=cache)
+        
+        assert calls == [[1, 2], [4]]
+        assert [seg.shortened_text for seg in result] == ["short 2", "short 4"]
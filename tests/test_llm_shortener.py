@@ -6,7 +6,7 @@ import pytest
 from datetime import timedelta
 from unittest.mock import patch, MagicMock
 
-from src.srt_processor import SubtitleEntry
+from src.srt_processor import SubtitleBatch, SubtitleEntry
 from src.llm_shortener import (
     HighCPSSegment,
     find_high_cps_segments,
@@ -15,9 +15,26 @@ from src.llm_shortener import (
     export_segments_json,
     load_segments_json,
     shorten_with_llm,
+    _first_letter_is_upper,
+    _parse_json_array,
+    _retry_delay,
 )
 
 
+class TestHighCPSSegment:
+    """Tests for the HighCPSSegment record."""
+
+    def test_slots_without_instance_dict(self):
+        """Segments use slots but stay mutable for shortened_text."""
+        seg = HighCPSSegment(index=1, original_text="Hi", current_cps=25,
+                             target_cps=21, chars_to_reduce=1)
+        assert not hasattr(seg, '__dict__')
+        seg.shortened_text = "H"
+        assert seg.shortened_text == "H"
+        with pytest.raises(AttributeError):
+            seg.extra = 1
+
+
 class TestFindHighCPSSegments:
     """Tests for finding high-CPS segments."""
 
@@ -60,6 +77,35 @@ class TestFindHighCPSSegments:
         assert segments[0].context_before == "Before text"
         assert segments[0].context_after == "After text"
 
+    def test_zero_duration_and_exact_target_skipped(self):
+        """Infinite-CPS entries and entries exactly at the target are not segments."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=1), timedelta(seconds=1), "No duration at all here"),
+            SubtitleEntry(2, timedelta(seconds=2), timedelta(seconds=3), "x" * 21),  # 21 CPS
+            SubtitleEntry(3, timedelta(seconds=4), timedelta(seconds=5), "y" * 40),  # 40 CPS
+        ]
+        
+        segments = find_high_cps_segments(subs, target_cps=21, min_reduction=6)
+        
+        assert [seg.index for seg in segments] == [3]
+        assert segments[0].chars_to_reduce == 19
+        assert segments[0].context_before == "x" * 21
+
+    def test_batch_matches_list(self):
+        """A SubtitleBatch yields the same segments as its entries."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=1), timedelta(seconds=1), "No duration at all here"),
+            SubtitleEntry(2, timedelta(seconds=2), timedelta(seconds=3), "y" * 40),
+            SubtitleEntry(3, timedelta(seconds=4), timedelta(seconds=4.5), "Way too long for this"),
+            SubtitleEntry(4, timedelta(seconds=5), timedelta(seconds=6), "- and then lowercase"),
+        ]
+        
+        segments = find_high_cps_segments(SubtitleBatch.from_entries(subs), target_cps=21)
+        
+        assert segments == find_high_cps_segments(subs, target_cps=21)
+        assert [seg.index for seg in segments] == [2, 3]
+        assert segments[1].next_is_uppercase is False
+
     def test_next_is_uppercase_detection(self):
         """Detect if next text starts with uppercase."""
         subs = [
@@ -74,6 +120,25 @@ class TestFindHighCPSSegments:
         assert segments[0].next_is_uppercase == True
 
 
+class TestFirstLetterIsUpper:
+    """Tests for the next-text capitalization check."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Hello", True),
+        ("hello", False),
+        ("- and then", False),
+        ("- Élan", True),
+        ("... 123 ² ½ éh", False),
+        ("♪ " * 30 + "la la", False),
+        ("♪ " * 30 + "La la", True),
+        ("", True),
+        ("... 42 ...", True),
+    ])
+    def test_first_letter(self, text, expected):
+        """Only the first alphabetic character decides; no letter counts as uppercase."""
+        assert _first_letter_is_upper(text) is expected
+
+
 class TestBuildShorteningPrompt:
     """Tests for prompt building."""
 
@@ -144,6 +209,45 @@ class TestApplyShortenedText:
         
         assert result[0].text == "Original"  # Unchanged
 
+    def test_apply_reuses_untouched_entries(self):
+        """Untouched entries are reused; the input list itself is left alone."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "Keep me"),
+            SubtitleEntry(2, timedelta(seconds=2), timedelta(seconds=3), "Shorten me please"),
+        ]
+        segments = [
+            HighCPSSegment(index=2, original_text="Shorten me please", current_cps=25,
+                           target_cps=21, chars_to_reduce=5, shortened_text="Shorter"),
+        ]
+        
+        result = apply_shortened_text(subs, segments)
+        
+        assert result is not subs
+        assert result[0] is subs[0]
+        assert result[1].text == "Shorter"
+        assert result[1].char_count == 7
+        assert subs[1].text == "Shorten me please"
+        assert apply_shortened_text(subs, []) == subs
+
+    def test_apply_to_batch_in_place(self):
+        """A SubtitleBatch is updated in place and matches the list result."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "Keep me"),
+            SubtitleEntry(2, timedelta(seconds=2), timedelta(seconds=3), "Shorten me\nplease"),
+        ]
+        segments = [
+            HighCPSSegment(index=2, original_text="Shorten me\nplease", current_cps=25,
+                           target_cps=21, chars_to_reduce=5, shortened_text="Shorter"),
+        ]
+        batch = SubtitleBatch.from_entries(subs)
+        
+        assert apply_shortened_text(batch, segments) is batch
+        assert batch.texts == ["Keep me", "Shorter"]
+        assert batch.line_counts == [1, 1]
+        entries = batch.to_entries()
+        assert entries == apply_shortened_text(subs, segments)
+        assert entries[1].cps == 7.0
+
 
 class TestExportLoadJSON:
     """Tests for JSON export/load."""
@@ -204,6 +308,77 @@ class TestExportLoadJSON:
         assert 'chars_to_reduce' in data[0]
 
 
+    def test_export_layout_matches_json_dump(self, tmp_path):
+        """Streamed output is laid out like json.dump(indent=2)."""
+        segments = [
+            HighCPSSegment(index=i, original_text=f"Línea\n{i}", current_cps=25.123,
+                           target_cps=21, chars_to_reduce=5, shortened_text="♪")
+            for i in range(3)
+        ]
+        json_path = tmp_path / "layout.json"
+        export_segments_json(segments, str(json_path))
+        
+        content = json_path.read_text(encoding='utf-8')
+        assert content == json.dumps(json.loads(content), ensure_ascii=False, indent=2)
+        
+        export_segments_json([], str(json_path))
+        assert load_segments_json(str(json_path)) == []
+
+    def test_orjson_and_stdlib_write_same_bytes(self, tmp_path, monkeypatch):
+        """With orjson installed, the output is byte-identical to the json fallback."""
+        orjson = pytest.importorskip("orjson")
+        import src.llm_shortener as llm_module
+        
+        segments = [
+            HighCPSSegment(index=1, original_text="Wait\n\"what\"?", current_cps=30.456,
+                           target_cps=21.5, chars_to_reduce=9, context_before="Ça va",
+                           shortened_text=None),
+        ]
+        fast_path = tmp_path / "orjson.json"
+        export_segments_json(segments, str(fast_path))
+        monkeypatch.setattr(llm_module, 'orjson', None)
+        slow_path = tmp_path / "stdlib.json"
+        export_segments_json(segments, str(slow_path))
+        
+        assert fast_path.read_bytes() == slow_path.read_bytes()
+
+    def test_stdlib_fallback_round_trip(self, tmp_path, monkeypatch):
+        """Export and load work without orjson."""
+        import src.llm_shortener as llm_module
+        monkeypatch.setattr(llm_module, 'orjson', None)
+        
+        segments = [
+            HighCPSSegment(index=4, original_text="Línea", current_cps=22.0,
+                           target_cps=21, chars_to_reduce=6, shortened_text="Lín"),
+        ]
+        json_path = tmp_path / "fallback.json"
+        export_segments_json(segments, str(json_path))
+        
+        assert load_segments_json(str(json_path)) == segments
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_file_object_round_trip(self, tmp_path, monkeypatch, use_orjson):
+        """Binary file objects work like paths and are left open."""
+        import io
+        import src.llm_shortener as llm_module
+        if not use_orjson:
+            monkeypatch.setattr(llm_module, 'orjson', None)
+        
+        segments = [
+            HighCPSSegment(index=2, original_text="Ça va?", current_cps=24.5,
+                           target_cps=21, chars_to_reduce=2, shortened_text="Ça?"),
+        ]
+        json_path = tmp_path / "segments.json"
+        export_segments_json(segments, str(json_path))
+        buffer = io.BytesIO()
+        export_segments_json(segments, buffer)
+        
+        assert not buffer.closed
+        assert buffer.getvalue() == json_path.read_bytes()
+        buffer.seek(0)
+        assert load_segments_json(buffer) == segments
+
+
 class TestShortenWithLLM:
     """Tests for LLM integration (mocked)."""
 
@@ -236,6 +411,100 @@ class TestShortenWithLLM:
             assert result[0].shortened_text == "Shortened"
 
 
+class TestShortenWithLLMBatching:
+    """Tests for batched LLM requests (fake client)."""
+
+    def _segments(self, count):
+        return [
+            HighCPSSegment(index=i, original_text=f"Text {i}", current_cps=25,
+                           target_cps=21, chars_to_reduce=6)
+            for i in range(1, count + 1)
+        ]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_batches_cover_all_segments(self, max_workers, fake_genai):
+        """Segments are split into batches and every result is applied."""
+        calls = []
+        segments = self._segments(45)
+        with patch.dict('sys.modules', fake_genai(calls)):
+            result = shorten_with_llm(segments, "key", batch_size=20, max_workers=max_workers)
+        
+        assert sorted(len(c) for c in calls) == [5, 20, 20]
+        assert sorted(i for c in calls for i in c) == list(range(1, 46))
+        assert [seg.shortened_text for seg in result] == [f"short {i}" for i in range(1, 46)]
+
+    def test_retry_resends_only_unanswered_segments(self, fake_genai):
+        """Segments missing from a reply are re-prompted on their own."""
+        calls = []
+        modules = fake_genai(calls)
+        client = modules['google.genai'].Client.return_value
+        echo = client.models.generate_content.side_effect
+        
+        def drop_last_once(model, contents):
+            response = echo(model, contents)
+            if len(calls) == 1:
+                response.text = json.dumps(json.loads(response.text)[:-1])
+            return response
+        
+        client.models.generate_content.side_effect = drop_last_once
+        segments = self._segments(3)
+        with patch.dict('sys.modules', modules):
+            result = shorten_with_llm(segments, "key", batch_size=20)
+        
+        assert calls == [[1, 2, 3], [3]]
+        assert [seg.shortened_text for seg in result] == ["short 1", "short 2", "short 3"]
+
+
+class TestRetryDelay:
+    """Tests for rate-limit retry delays."""
+
+    def test_retry_after_header(self):
+        """A Retry-After response header is honoured."""
+        error = Exception("429 Too Many Requests")
+        error.response = MagicMock(headers={'Retry-After': '7'})
+        assert _retry_delay(error, 0) == 7.0
+
+    def test_retry_hint_in_message(self):
+        """A retry hint in the error message is honoured and capped."""
+        assert _retry_delay(Exception("429 RESOURCE_EXHAUSTED. Please retry in 23.4s."), 0) == 23.4
+        assert _retry_delay(Exception("rate limited, retry after 600"), 0) == 60.0
+
+    def test_backoff_with_jitter(self):
+        """Without a hint, the delay doubles per attempt plus jitter."""
+        for attempt in range(3):
+            delay = _retry_delay(Exception("rate limit exceeded"), attempt)
+            assert 2 ** attempt <= delay <= 2 ** attempt + 0.5
+
+
+class TestParseJsonArray:
+    """Tests for extracting the JSON array from LLM responses."""
+
+    def test_bare_json(self):
+        """A bare JSON array is decoded directly."""
+        assert _parse_json_array('\n[{"index": 1, "text": "Hi"}]\n') == [{"index": 1, "text": "Hi"}]
+
+    def test_markdown_wrapped(self):
+        """An array inside a markdown code fence is extracted."""
+        text = '```json\n[{"index": 2, "text": "Go"}]\n```'
+        assert _parse_json_array(text) == [{"index": 2, "text": "Go"}]
+
+    def test_object_wrapping_array(self):
+        """Valid JSON that is not an array falls back to the inner array."""
+        assert _parse_json_array('{"results": [1, 2]}') == [1, 2]
+
+    def test_no_array(self):
+        """A response without an array gives None."""
+        assert _parse_json_array("Sorry, I can't help with that.") is None
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Without orjson the stdlib decoder handles both response shapes."""
+        import src.llm_shortener as llm_module
+        
+        monkeypatch.setattr(llm_module, '_json_loads', json.loads)
+        assert _parse_json_array('[{"index": 1, "text": "Hi"}]') == [{"index": 1, "text": "Hi"}]
+        assert _parse_json_array('{"results": [1, 2]}') == [1, 2]
+
+
 # Optional: Integration test with real API (skipped by default)
 @pytest.mark.skipif(
     not os.environ.get('GEMINI_API_KEY'),
@@ -5,10 +5,12 @@ import pytest
 from datetime import timedelta
 from src.srt_processor import (
     load_srt,
+    load_srt_batch,
     save_srt,
     calculate_cps,
     get_subtitle_stats,
     SubtitleEntry,
+    SubtitleBatch,
 )
 
 
@@ -60,6 +62,96 @@ class TestCalculateCPS:
         assert calculate_cps(sub) == 41.0
 
 
+class TestSubtitleEntry:
+    """Tests for SubtitleEntry."""
+
+    def test_with_end_matches_new_entry(self):
+        """with_end() gives the same entry as building one from scratch."""
+        sub = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "Hello\nworld")
+        extended = sub.with_end(timedelta(seconds=2))
+        expected = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "Hello\nworld")
+        
+        assert extended == expected
+        assert extended.end_us == expected.end_us
+        assert extended.char_count == expected.char_count
+        assert extended.line_count == expected.line_count
+        assert calculate_cps(extended) == 5.0
+        # The original is untouched
+        assert sub.end == timedelta(seconds=1)
+
+
+    def test_with_text_and_index_match_new_entry(self):
+        """with_text() and with_index() recompute only what they change."""
+        sub = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "Hello")
+        
+        retexted = sub.with_text("Hello\nthere world")
+        expected = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "Hello\nthere world")
+        assert retexted == expected
+        assert (retexted.char_count, retexted.line_count, retexted.cps) == (16, 2, 8.0)
+        
+        reindexed = sub.with_index(7)
+        assert reindexed == SubtitleEntry(7, timedelta(seconds=0), timedelta(seconds=2), "Hello")
+        assert reindexed.cps == sub.cps
+
+    def test_merged_with_matches_new_entry(self):
+        """merged_with() adds up the counts of both entries."""
+        first = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=1), "Hi\r\nthere")
+        second = SubtitleEntry(2, timedelta(seconds=1), timedelta(seconds=2), "You")
+        
+        merged = first.merged_with(second)
+        expected = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "Hi\r\nthere\nYou")
+        assert merged == expected
+        assert (merged.char_count, merged.line_count, merged.cps) == (10, 3, 5.0)
+        
+        extended = first.merged_with(second, timedelta(seconds=4))
+        assert extended.end_us == 4_000_000
+        assert extended.cps == 2.5
+
+    def test_copies_stay_frozen(self):
+        """Entries built by the with_*() helpers reject attribute assignment too."""
+        from dataclasses import FrozenInstanceError
+        
+        sub = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "Hello")
+        for copy in (sub, sub.with_end(timedelta(seconds=3)), sub.with_text("Hi"), sub.with_index(2)):
+            with pytest.raises(FrozenInstanceError):
+                copy.text = "changed"
+
+
+class TestSubtitleBatch:
+    """Tests for the column-wise subtitle container."""
+
+    def test_round_trip(self):
+        """Entries survive a trip through a batch, cached values included."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=1), timedelta(seconds=2.5), "Hello\r\nworld"),
+            SubtitleEntry(None, timedelta(seconds=3), timedelta(seconds=3), ""),
+        ]
+        batch = SubtitleBatch.from_entries(subs)
+        
+        assert len(batch) == 2
+        assert batch.starts_us == [1_000_000, 3_000_000]
+        assert batch.char_counts == [10, 0]
+        assert batch.line_counts == [2, 1]
+        
+        entries = batch.to_entries()
+        assert entries == subs
+        assert [e.cps for e in entries] == [s.cps for s in subs]
+        assert batch.entry(0) == subs[0]
+        assert batch.entry(0).line_count == 2
+
+    def test_set_text_updates_counts(self):
+        """set_text keeps the cached counts in step with the new text."""
+        sub = SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=2), "One")
+        batch = SubtitleBatch.from_entries([sub])
+        
+        batch.set_text(0, "Two\nlines")
+        
+        assert batch.char_counts == [8]
+        assert batch.line_counts == [2]
+        assert batch.entry(0) == sub.with_text("Two\nlines")
+        assert batch.entry(0).cps == 4.0
+
+
 class TestSubtitleStats:
     """Tests for subtitle statistics."""
 
@@ -85,13 +177,59 @@ class TestSubtitleStats:
         assert stats['avg_cps'] == 0
         assert stats['high_cps_count'] == 0
 
+    def test_stats_skip_zero_duration_and_count_strictly_above(self):
+        """Infinite CPS is left out, and entries exactly at target don't count."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=3), timedelta(seconds=4), "Twenty one chars here"),  # 21 CPS
+            SubtitleEntry(2, timedelta(seconds=5), timedelta(seconds=5), "Zero duration"),  # inf
+            SubtitleEntry(3, timedelta(seconds=0), timedelta(seconds=2), "Hi there"),  # 4 CPS
+            SubtitleEntry(4, timedelta(seconds=6), timedelta(seconds=7), "Twenty two chars here!"),  # 22 CPS
+        ]
+        stats = get_subtitle_stats(subs, target_cps=21)
+        
+        assert stats['min_cps'] == 4.0
+        assert stats['max_cps'] == 22.0
+        assert stats['avg_cps'] == 47 / 3
+        assert stats['high_cps_count'] == 1
+        assert stats['total_count'] == 4
+        
+        only_zero = get_subtitle_stats(subs[1:2], target_cps=21)
+        assert (only_zero['max_cps'], only_zero['high_cps_count'], only_zero['total_count']) == (0, 0, 1)
+
+    def test_stats_p95(self):
+        """p95_cps is read from the sorted finite CPS values."""
+        subs = [
+            SubtitleEntry(i, timedelta(seconds=2 * i), timedelta(seconds=2 * i + 1), "x" * cps)
+            for i, cps in enumerate(range(60, 0, -1))
+        ]
+        subs.append(SubtitleEntry(99, timedelta(seconds=500), timedelta(seconds=500), "Zero"))
+        
+        stats = get_subtitle_stats(subs, target_cps=21)
+        
+        assert stats['p95_cps'] == 58.0  # position 57 of 1..60, inf left out
+        assert stats['high_cps_count'] == 39
+        assert get_subtitle_stats([], target_cps=21)['p95_cps'] == 0
+
+    def test_stats_from_batch(self):
+        """A SubtitleBatch gives the same statistics as its entries."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=0), timedelta(seconds=3), "Hi there"),
+            SubtitleEntry(2, timedelta(seconds=3), timedelta(seconds=3), "Zero duration"),
+            SubtitleEntry(3, timedelta(seconds=4), timedelta(seconds=4.7), "Hello world test"),
+        ]
+        batch = SubtitleBatch.from_entries(subs)
+        
+        assert batch.cps() == [sub.cps for sub in subs]
+        assert get_subtitle_stats(batch, target_cps=15) == get_subtitle_stats(subs, target_cps=15)
+        assert get_subtitle_stats(SubtitleBatch.from_entries([]))['total_count'] == 0
+
 
 class TestLoadSaveSRT:
     """Tests for SRT file I/O."""
 
-    def test_load_sample_srt(self):
+    def test_load_sample_srt(self, sample_subs):
         """Load sample SRT file."""
-        subs = load_srt('tests/fixtures/sample.srt')
+        subs = sample_subs
         assert len(subs) > 0
         assert subs[0].index == 1
         assert subs[0].text.strip() != ""
@@ -121,3 +259,93 @@ class TestLoadSaveSRT:
         assert len(reloaded) == 2
         assert reloaded[0].text == "Hello world"
         assert reloaded[1].text == "Test subtitle"
+
+    def test_load_crlf_and_multiline(self, tmp_path):
+        """CRLF line endings, a BOM and multi-line text are parsed."""
+        path = tmp_path / "crlf.srt"
+        path.write_bytes(
+            "\ufeff1\r\n00:00:01,500 --> 00:00:03,000\r\nHello  \r\n- world\r\n\r\n"
+            "2\r\n01:02:03,004 --> 01:02:04,000\r\nBye\r\n".encode("utf-8")
+        )
+        subs = load_srt(str(path))
+        assert [(s.index, s.start, s.end, s.text) for s in subs] == [
+            (1, timedelta(seconds=1.5), timedelta(seconds=3), "Hello\n- world"),
+            (2, timedelta(hours=1, minutes=2, seconds=3, milliseconds=4),
+             timedelta(hours=1, minutes=2, seconds=4), "Bye"),
+        ]
+        assert [(s.char_count, s.line_count) for s in subs] == [(12, 2), (3, 1)]
+        assert subs[0].cps == 8.0
+
+    def test_load_latin1_fallback(self, tmp_path):
+        """Files that are not valid UTF-8 are read as Latin-1."""
+        path = tmp_path / "latin1.srt"
+        path.write_bytes("1\n00:00:01,000 --> 00:00:02,000\nCafé à la crème\n".encode("latin-1"))
+        subs = load_srt(str(path))
+        assert subs[0].text == "Café à la crème"
+
+    def test_load_irregular_blocks(self, tmp_path):
+        """Blocks the fast path can't read are handled like pysrt does."""
+        path = tmp_path / "irregular.srt"
+        path.write_text(
+            "00:00:01,000 --> 00:00:02,000\nNo index\n\n"
+            "2\n00:00:03.000 --> 00:00:04.000 X1:10 X2:20\nPosition\n\n"
+            "3\nnot a time line\n\n"
+            "4\n00:00:05,000 --> 00:00:06,000\nLast\n",
+            encoding="utf-8",
+        )
+        subs = load_srt(str(path))
+        assert [(s.index, s.text) for s in subs] == [
+            (None, "No index"), (2, "Position"), (4, "Last"),
+        ]
+        assert subs[1].start == timedelta(seconds=3)
+
+    def test_load_batch_matches_entries(self, tmp_path):
+        """load_srt_batch holds the same subtitles as load_srt, column-wise."""
+        path = tmp_path / "batch.srt"
+        path.write_text(
+            "1\r\n00:00:01,000 --> 00:00:02,500\r\nTwo\r\nlines\r\n\r\n"
+            "00:00:03,000 --> 00:00:04,000\r\nNo index\r\n\r\n"
+            "3\r\n00:00:05,000 --> 00:00:05,000\r\nZero\r\n",
+            encoding="utf-8",
+        )
+        subs = load_srt(str(path))
+        batch = load_srt_batch(str(path))
+        
+        assert batch == SubtitleBatch.from_entries(subs)
+        assert batch.indexes == [1, None, 3]
+        assert batch.starts_us == [1_000_000, 3_000_000, 5_000_000]
+        assert batch.line_counts == [2, 1, 1]
+        assert batch.cps() == [sub.cps for sub in subs]
+        
+        empty = tmp_path / "empty.srt"
+        empty.write_text("", encoding="utf-8")
+        assert len(load_srt_batch(str(empty))) == 0
+
+    def test_save_keeps_milliseconds(self, tmp_path):
+        """Times survive a save/load round trip to the millisecond."""
+        subs = [
+            SubtitleEntry(1, timedelta(seconds=1.001), timedelta(hours=1, seconds=2.029), "One"),
+        ]
+        output_path = tmp_path / "ms.srt"
+        save_srt(subs, str(output_path))
+        
+        reloaded = load_srt(str(output_path))
+        assert reloaded[0].start == timedelta(seconds=1.001)
+        assert reloaded[0].end == timedelta(hours=1, seconds=2.029)
+
+    def test_save_writes_srt_layout(self, tmp_path):
+        """Saved file has sequential indexes, SRT timestamps and blank separators."""
+        subs = [
+            SubtitleEntry(7, timedelta(seconds=-1), timedelta(seconds=1.5), "One\nTwo"),
+            SubtitleEntry(9, timedelta(hours=101, milliseconds=7), timedelta(hours=101, seconds=1), "Three"),
+        ]
+        output_path = tmp_path / "layout.srt"
+        save_srt(subs, str(output_path))
+        
+        with open(output_path, encoding='utf-8', newline='') as f:
+            content = f.read()
+        nl = os.linesep
+        assert content == nl.join([
+            "1", "00:00:00,000 --> 00:00:01,500", "One", "Two", "",
+            "2", "101:00:00,007 --> 101:00:01,000", "Three", "", "",
+        ])
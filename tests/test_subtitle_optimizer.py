@@ -14,14 +14,12 @@ from src.interjections_en import INTERJECTIONS_EN, INTERJECTIONS_SKIP_EN
 class TestIntegrationPipeline:
     """Integration tests for the full pipeline."""
 
-    def test_full_pipeline_sample_srt(self, tmp_path):
+    def test_full_pipeline_sample_srt(self, tmp_path, sample_subs):
         """Test full pipeline with sample SRT file."""
-        # Load sample
-        subs = load_srt('tests/fixtures/sample.srt')
+        # Loaded once per session by the fixture
+        subs = sample_subs
         assert len(subs) > 0
         
-        initial_stats = get_subtitle_stats(subs, target_cps=21)
-        
         # Phase 1: Remove interjections
         remover = RemoveInterjection()
         cleaned = []
@@ -74,13 +72,10 @@ class TestIntegrationPipeline:
         save_srt(optimized, str(output_srt))
         assert output_srt.exists()
         
-        # Reload and verify
+        # Reload and verify; merging never adds entries
         reloaded = load_srt(str(output_srt))
         assert len(reloaded) == len(optimized)
-        
-        # Final stats should be same or better
-        final_stats = get_subtitle_stats(reloaded, target_cps=21)
-        assert final_stats['total_count'] <= initial_stats['total_count']
+        assert len(optimized) <= len(subs)
 
     def test_interjection_integration(self):
         """Test interjection removal with real subtitle patterns."""
@@ -105,14 +100,65 @@ class TestIntegrationPipeline:
         # "Oh" should be removed but dialog structure preserved
         assert "baby" in result2
 
-    def test_cps_calculation_real_subtitles(self):
+    def test_cps_calculation_real_subtitles(self, sample_subs):
         """Test CPS calculation with real subtitle timing."""
-        subs = load_srt('tests/fixtures/sample.srt')
-        
-        stats = get_subtitle_stats(subs, target_cps=21)
+        stats = get_subtitle_stats(sample_subs, target_cps=21)
         
         # Verify reasonable CPS values
         assert 0 <= stats['min_cps'] <= 50
         assert stats['max_cps'] >= stats['min_cps']
         assert stats['avg_cps'] >= stats['min_cps']
         assert stats['avg_cps'] <= stats['max_cps']
+
+
+class TestPhaseFusion:
+    """The fused text-cleaning pass matches the separate phases."""
+
+    def test_clean_text_matches_separate_phases(self):
+        """phase1_clean_text() gives the same entries as phases 1 and 1.5."""
+        from subtitle_optimizer import (
+            phase1_clean_text,
+            phase1_remove_interjections,
+            phase1_5_reduce_lines,
+        )
+        
+        texts = [
+            "Hmm.",
+            "Wow, um, you're just, this is...",
+            "One\nTwo\nThree",
+            "- Uh-huh.\n- Okay.\nFine.",
+            "Nothing to do here.",
+        ]
+        subs = [
+            SubtitleEntry(i, timedelta(seconds=2 * i), timedelta(seconds=2 * i + 1), text)
+            for i, text in enumerate(texts, 1)
+        ]
+        
+        expected = phase1_5_reduce_lines(phase1_remove_interjections(subs), 2)
+        assert phase1_clean_text(subs, 2) == expected
+        assert phase1_clean_text(subs, 2, remove_interjections=False) == phase1_5_reduce_lines(subs, 2)
+
+
+class TestLoadEnvFile:
+    """Tests for the .env loader."""
+
+    def test_loads_values_without_overriding(self, tmp_path, monkeypatch):
+        """Keys are read once; comments, blanks and existing variables are left alone."""
+        from subtitle_optimizer import load_env_file
+        
+        env_path = tmp_path / '.env'
+        env_path.write_text(
+            "# comment\n\nSUBOPT_TEST_A = one=two \nnot a pair\nSUBOPT_TEST_B=new\n"
+        )
+        environ = {'SUBOPT_TEST_B': 'old'}
+        monkeypatch.setattr(os, 'environ', environ)
+        
+        load_env_file(env_path)
+        
+        assert environ == {'SUBOPT_TEST_A': 'one=two', 'SUBOPT_TEST_B': 'old'}
+
+    def test_missing_file_is_ignored(self, tmp_path):
+        """A missing .env file is not an error."""
+        from subtitle_optimizer import load_env_file
+        
+        load_env_file(tmp_path / 'missing.env')